@@ -4,71 +4,65 @@ FAB Events Calendar Cleaner
 Cleans both local and global FAB event calendars for testing purposes
 """
 
+from __future__ import annotations
+
 import os
-import logging
+import re
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from googleapiclient.discovery import build
-from google.oauth2.service_account import Credentials
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, List, Dict, Optional, Tuple
+from fab_auth import (
+    BATCH_SIZE, MAX_TRIES, SERVICE_ACCOUNT_FILE, build_calendar_service, execute_with_retry, get_thread_service,
+    is_retryable, iter_events, load_credentials as load_cached_credentials, retry_delay
+)
+from fab_common import RUN_STARTED_AT, load_env, prompt_user, setup_logging
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+    from google.oauth2.service_account import Credentials
 
 # Load environment variables
-load_dotenv(dotenv_path='.env', override=False)
-import os
-if os.path.exists('.env.local'):
-    load_dotenv(dotenv_path='.env.local', override=True)
+load_env()
 
 # Configuration
-SCOPES = ['https://www.googleapis.com/auth/calendar']
-SERVICE_ACCOUNT_FILE = 'sa.json'
+# Only request the fields the cleaner reads to shrink list responses
+EVENT_FIELDS = 'items(id,summary,description,start/date),nextPageToken'
+
+# Keywords that identify FAB events in the shared global calendar. Calendar's q= matches
+# whole tokens, so compound and hashtag spellings that FAB_RE catches as substrings are
+# listed too; --full-scan lists every event and applies FAB_RE for anything else.
+FAB_KEYWORDS = ('fab', 'fabtcg', '#fab', 'flesh and blood', 'battle hardened', 'calling', 'world championship',
+                'pro tour', 'world premiere')
+FAB_RE = re.compile('|'.join(re.escape(keyword) for keyword in FAB_KEYWORDS), re.IGNORECASE)
 
 # Calendar IDs from environment
 LOCAL_CALENDAR_ID = os.getenv('LOCAL_CALENDAR_ID')
 GLOBAL_CALENDAR_ID = os.getenv('CALENDAR_ID')
 
-def setup_logging():
-    """Setup logging to both console and file"""
-    # Create logs directory if it doesn't exist
-    os.makedirs('logs', exist_ok=True)
-    
-    # Create logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)
-    
-    # Clear any existing handlers
-    logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(console_formatter)
-    
-    # File handler with timestamp
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    file_handler = logging.FileHandler(f'logs/clean_calendar_{timestamp}.log')
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(file_formatter)
-    
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
-    return logger
-
 # Setup logging
-logger = setup_logging()
+logger = setup_logging('clean_calendar', __name__)
 
-def setup_google_calendar() -> Optional[build]:
-    """Set up Google Calendar service using service account credentials"""
+def load_credentials() -> Optional[Credentials]:
+    """Load service account credentials for the Google Calendar API"""
     try:
         if not os.path.exists(SERVICE_ACCOUNT_FILE):
             logger.error(f"Error: Service account file '{SERVICE_ACCOUNT_FILE}' not found")
             return None
         
-        credentials = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-        service = build('calendar', 'v3', credentials=credentials)
+        return load_cached_credentials(SERVICE_ACCOUNT_FILE)
+    
+    except Exception as e:
+        logger.error(f"Error loading service account credentials: {e}")
+        return None
+
+def setup_google_calendar(credentials: Credentials) -> Resource | None:
+    """Set up Google Calendar service using service account credentials"""
+    try:
+        service = build_calendar_service(credentials)
         
         logger.info("Successfully connected to Google Calendar API")
         return service
@@ -77,47 +71,62 @@ def setup_google_calendar() -> Optional[build]:
         logger.error(f"Error setting up Google Calendar: {e}")
         return None
 
-def get_events_to_clean(service: build, calendar_id: str, calendar_name: str, future_only: bool) -> List[Dict]:
+@lru_cache(maxsize=2)
+def get_cleanup_window(future_only: bool) -> Tuple[str, str]:
+    """Return the (timeMin, timeMax) RFC3339 bounds for the cleanup window (computed once per process)."""
+    # Get events from now forward, or include recent past for full cleanup.
+    now = datetime.utcnow()
+    if future_only:
+        start_date = now.isoformat() + 'Z'
+    else:
+        start_date = (now - timedelta(days=30)).isoformat() + 'Z'
+    end_date = (now + timedelta(days=365)).isoformat() + 'Z'
+    return start_date, end_date
+
+def search_fab_events(credentials: Credentials, calendar_id: str, **params) -> List[Dict]:
+    """Search the calendar server-side with one q= query per FAB keyword and union the results"""
+    def _search(keyword: str) -> List[Dict]:
+        return list(iter_events(get_thread_service(credentials), calendar_id, EVENT_FIELDS, q=keyword, **params))
+    
+    events_by_id: Dict[str, Dict] = {}
+    with ThreadPoolExecutor(max_workers=len(FAB_KEYWORDS)) as executor:
+        for results in executor.map(_search, FAB_KEYWORDS):
+            for event in results:
+                events_by_id.setdefault(event['id'], event)
+    
+    # q= also matches fields such as location, so keep the keyword check on summary/description
+    return filter_fab_events(events_by_id.values())
+
+def filter_fab_events(events: Iterable[Dict]) -> List[Dict]:
+    """Keep events whose summary or description matches FAB_RE, sorted by start date"""
+    fab_events = [
+        event for event in events
+        if FAB_RE.search(event.get('summary', '')) or FAB_RE.search(event.get('description', ''))
+    ]
+    fab_events.sort(key=lambda event: (event.get('start') or {}).get('date', ''))
+    return fab_events
+
+def get_events_to_clean(credentials: Credentials, calendar_id: str, calendar_name: str, future_only: bool,
+                        full_scan: bool = False) -> List[Dict]:
     """Get events to clean from a specific calendar (all events for local, FAB events for global)."""
     try:
-        # Get events from now forward, or include recent past for full cleanup.
-        now = datetime.utcnow()
-        if future_only:
-            start_date = now.isoformat() + 'Z'
-        else:
-            start_date = (now - timedelta(days=30)).isoformat() + 'Z'
-        end_date = (now + timedelta(days=365)).isoformat() + 'Z'
-        
         logger.info(f"Fetching events from {calendar_name} calendar...")
         
-        events_result = service.events().list(
-            calendarId=calendar_id,
-            timeMin=start_date,
-            timeMax=end_date,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        events = events_result.get('items', [])
+        start_date, end_date = get_cleanup_window(future_only)
         
         # For local calendar, get ALL events (since they might not have FAB keywords)
-        # For global calendar, filter for FAB events only
+        # For global calendar, let the API filter for FAB events (or list everything and filter here with full_scan)
         if 'Local' in calendar_name:
+            service = get_thread_service(credentials)
+            events = list(iter_events(service, calendar_id, EVENT_FIELDS, timeMin=start_date, timeMax=end_date, orderBy='startTime'))
             logger.info(f"Found {len(events)} total events in {calendar_name} calendar")
             return events
         else:
-            # Filter for FAB events only in global calendar
-            fab_events = []
-            for event in events:
-                summary = event.get('summary', '')
-                description = event.get('description', '')
-                
-                # Check if this is a FAB event
-                if any(keyword in summary.lower() for keyword in ['fab', 'flesh and blood', 'battle hardened', 'calling', 'world championship', 'pro tour', 'world premiere']):
-                    fab_events.append(event)
-                elif any(keyword in description.lower() for keyword in ['fab', 'flesh and blood', 'battle hardened', 'calling', 'world championship', 'pro tour', 'world premiere']):
-                    fab_events.append(event)
-            
+            if full_scan:
+                service = get_thread_service(credentials)
+                fab_events = filter_fab_events(iter_events(service, calendar_id, EVENT_FIELDS, timeMin=start_date, timeMax=end_date))
+            else:
+                fab_events = search_fab_events(credentials, calendar_id, timeMin=start_date, timeMax=end_date)
             logger.info(f"Found {len(fab_events)} FAB events in {calendar_name} calendar")
             return fab_events
         
@@ -125,76 +134,160 @@ def get_events_to_clean(service: build, calendar_id: str, calendar_name: str, fu
         logger.error(f"Error fetching events from {calendar_name} calendar: {e}")
         return []
 
-def delete_event(service: build, calendar_id: str, event_id: str, event_summary: str, calendar_name: str) -> bool:
-    """Delete a specific event from a calendar"""
-    try:
-        service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
-        logger.info(f"  [OK] DELETED: {event_summary}")
-        return True
-    except Exception as e:
-        logger.error(f"  [ERROR] deleting {event_summary}: {e}")
-        return False
+def extract_event_rows(events: List[Dict]) -> List[Tuple[Optional[str], str, str]]:
+    """Extract (id, summary, start date) once per event for listing and deletion"""
+    return [
+        (event.get('id'), event.get('summary', 'Unknown Event'), (event.get('start') or {}).get('date', 'No date'))
+        for event in events
+    ]
+
+def delete_events_batch(service: Resource, calendar_id: str, rows: List[Tuple[Optional[str], str, str]], calendar_name: str) -> int:
+    """Delete events using the Calendar batch endpoint (up to 50 deletes per HTTP request)
+
+    Logs one summary line per batch; deletes rejected with 429/500/503 are re-sent
+    in a later batch with backoff, and remaining errors are logged once at the end.
+    """
+    deleted_count = 0
+    batch_deleted = 0
+    error_lines: List[str] = []
+    retry_rows: List[Tuple[int, str, str]] = []
+    pending: Dict[str, Tuple[int, str, str]] = {}
+
+    def _on_delete(request_id, response, exception):
+        nonlocal batch_deleted
+        index, event_id, summary = pending[request_id]
+        if exception is None:
+            batch_deleted += 1
+        elif is_retryable(exception):
+            retry_rows.append((index, event_id, summary))
+        else:
+            error_lines.append(f"  [ERROR] deleting {summary}: {exception}")
+
+    to_delete = [(index, event_id, summary) for index, (event_id, summary, _start) in enumerate(rows) if event_id]
+    batch_number = 0
+    for attempt in range(MAX_TRIES):
+        for offset in range(0, len(to_delete), BATCH_SIZE):
+            batch_number += 1
+            batch_deleted = 0
+            errors_before = len(error_lines)
+            batch = service.new_batch_http_request(callback=_on_delete)
+            pending.clear()
+            for index, event_id, summary in to_delete[offset:offset + BATCH_SIZE]:
+                # request_id must be unique within a batch, so key it by the row position
+                pending[str(index)] = (index, event_id, summary)
+                batch.add(service.events().delete(calendarId=calendar_id, eventId=event_id), request_id=str(index))
+            try:
+                execute_with_retry(batch)
+            except Exception as e:
+                error_lines.append(f"  [ERROR] batch delete failed for {calendar_name} calendar: {e}")
+            deleted_count += batch_deleted
+            logger.info(f"Batch {batch_number}: deleted {batch_deleted} events, {len(error_lines) - errors_before} errors")
+        
+        if not retry_rows:
+            break
+        to_delete = sorted(retry_rows)
+        retry_rows.clear()
+        if attempt < MAX_TRIES - 1:
+            delay = retry_delay(attempt)
+            logger.warning(f"Retrying {len(to_delete)} rate-limited deletes in {delay:.1f}s")
+            time.sleep(delay)
+    else:
+        error_lines.extend(f"  [ERROR] deleting {summary}: retries exhausted" for _index, _event_id, summary in to_delete)
+    
+    if error_lines:
+        logger.error(f"{len(error_lines)} errors deleting from {calendar_name} calendar:\n" + "\n".join(error_lines))
+
+    return deleted_count
+
+def fetch_events_to_clean(credentials: Credentials, calendars: List[Tuple[str, str]], future_only: bool,
+                          full_scan: bool = False) -> Dict[str, List[Dict]]:
+    """Fetch events to clean for every (calendar_id, calendar_name) pair concurrently"""
+    events_by_calendar: Dict[str, List[Dict]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(calendars))) as executor:
+        futures = {executor.submit(get_events_to_clean, credentials, calendar_id, calendar_name, future_only, full_scan): calendar_name
+                   for calendar_id, calendar_name in calendars}
+        for future in as_completed(futures):
+            events_by_calendar[futures[future]] = future.result()
+    
+    return events_by_calendar
 
-def clean_calendar(service: build, calendar_id: str, calendar_name: str, future_only: bool) -> int:
-    """Clean all FAB events from a specific calendar"""
+def clean_calendar(service: Resource, calendar_id: str, calendar_name: str, events: List[Dict], assume_yes: bool = False,
+                   verbose: bool = False) -> int:
+    """Clean the given events from a specific calendar (without prompting or listing them when assume_yes)"""
     if not calendar_id:
         logger.warning(f"No {calendar_name} calendar ID configured, skipping...")
         return 0
     
     logger.info(f"Cleaning {calendar_name} calendar...")
     
-    # Get events to clean (all for local, FAB events for global)
-    events = get_events_to_clean(service, calendar_id, calendar_name, future_only)
-    
     if not events:
         logger.info(f"No events found in {calendar_name} calendar")
         return 0
     
-    # Display events that will be deleted
-    if 'Local' in calendar_name:
-        logger.info(f"ALL events to be deleted from {calendar_name} calendar:")
-    else:
-        logger.info(f"FAB events to be deleted from {calendar_name} calendar:")
-    logger.info("-" * 80)
-    
-    for i, event in enumerate(events, 1):
-        summary = event.get('summary', 'Unknown Event')
-        start = event.get('start', {}).get('date', 'No date')
-        event_id = event.get('id', 'No ID')
-        logger.info(f"{i}. {summary} ({start})")
+    rows = extract_event_rows(events)
     
-    logger.info("-" * 80)
+    # Unattended runs only need the count; the full listing is for the confirmation prompt or --verbose
+    if assume_yes and not verbose:
+        logger.info(f"{len(rows)} events to be deleted from {calendar_name} calendar (use --verbose to list them)")
+    else:
+        # Display events that will be deleted
+        if 'Local' in calendar_name:
+            logger.info(f"ALL events to be deleted from {calendar_name} calendar:")
+        else:
+            logger.info(f"FAB events to be deleted from {calendar_name} calendar:")
+        logger.info("-" * 80)
+        
+        # Emit the whole listing as one record instead of one per event
+        logger.info("\n".join(f"{i}. {summary} ({start})" for i, (_event_id, summary, start) in enumerate(rows, 1)))
+        
+        logger.info("-" * 80)
     
-    # Confirm deletion
-    if 'Local' in calendar_name:
-        confirm = input(f"\nAre you sure you want to delete ALL {len(events)} events from {calendar_name} calendar? (yes/no): ")
+    # Confirm deletion (the queued listing is written while the first batch is in flight)
+    if assume_yes:
+        confirm = 'yes'
+    elif 'Local' in calendar_name:
+        confirm = prompt_user(f"\nAre you sure you want to delete ALL {len(events)} events from {calendar_name} calendar? (yes/no): ")
     else:
-        confirm = input(f"\nAre you sure you want to delete {len(events)} FAB events from {calendar_name} calendar? (yes/no): ")
+        confirm = prompt_user(f"\nAre you sure you want to delete {len(events)} FAB events from {calendar_name} calendar? (yes/no): ")
     
     if confirm.lower() != 'yes':
         logger.info(f"Deletion cancelled for {calendar_name} calendar")
         return 0
     
-    # Delete events
-    deleted_count = 0
-    for event in events:
-        event_id = event.get('id')
-        summary = event.get('summary', 'Unknown Event')
-        
-        if event_id:
-            if delete_event(service, calendar_id, event_id, summary, calendar_name):
-                deleted_count += 1
+    # Delete events in batches
+    deleted_count = delete_events_batch(service, calendar_id, rows, calendar_name)
     
     logger.info(f"Successfully deleted {deleted_count} events from {calendar_name} calendar")
     return deleted_count
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Clean FAB events from the local and global calendars")
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help="delete without confirmation prompts (required when stdin is not a terminal)")
+    parser.add_argument('--future-only', action='store_true',
+                        help="only delete future events when not prompting")
+    parser.add_argument('--full-scan', action='store_true',
+                        help="list every global calendar event and match FAB keywords locally instead of searching with q=")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="list every event before deleting when not prompting")
+    return parser.parse_args(argv)
+
 def main():
     """Main function for calendar cleaning"""
+    args = parse_args()
+    assume_yes = args.yes
+    
     logger.info("=" * 80)
     logger.info("FAB Events Calendar Cleaner Started")
-    logger.info(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info(f"Timestamp: {RUN_STARTED_AT.strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("=" * 80)
     
+    # Unattended runs (cron, pipes) cannot confirm, so they must opt in to deleting
+    if not assume_yes and not sys.stdin.isatty():
+        logger.error("stdin is not a terminal and --yes was not given; refusing to delete without confirmation")
+        sys.exit(1)
+    
     # Check configuration
     if not LOCAL_CALENDAR_ID and not GLOBAL_CALENDAR_ID:
         logger.error("No calendar IDs configured! Check your .env file.")
@@ -202,33 +295,40 @@ def main():
         return
 
     # Cleanup scope prompt
-    prompt = "Delete future events only? (yes/no): "
-    future_only = input(prompt).strip().lower() in ('y', 'yes')
+    if assume_yes:
+        future_only = args.future_only
+        logger.info(f"Running without prompts (future events only: {future_only})")
+    else:
+        prompt = "Delete future events only? (yes/no): "
+        future_only = prompt_user(prompt).strip().lower() in ('y', 'yes')
     
     # Set up Google Calendar service
     logger.info("Setting up Google Calendar service...")
-    service = setup_google_calendar()
+    credentials = load_credentials()
+    service = setup_google_calendar(credentials) if credentials else None
     
     if not service:
         logger.error("Failed to setup Google Calendar service")
         return
     
-    total_deleted = 0
-    
-    # Clean local calendar
+    calendars = []
     if LOCAL_CALENDAR_ID:
-        deleted_local = clean_calendar(service, LOCAL_CALENDAR_ID, "Local DFW", future_only)
-        total_deleted += deleted_local
+        calendars.append((LOCAL_CALENDAR_ID, "Local DFW"))
     else:
         logger.info("Local calendar ID not configured, skipping...")
-    
-    # Clean global calendar
     if GLOBAL_CALENDAR_ID:
-        deleted_global = clean_calendar(service, GLOBAL_CALENDAR_ID, "Global Major", future_only)
-        total_deleted += deleted_global
+        calendars.append((GLOBAL_CALENDAR_ID, "Global Major"))
     else:
         logger.info("Global calendar ID not configured, skipping...")
     
+    # List both calendars concurrently; deletion stays sequential because it may prompt per calendar
+    events_by_calendar = fetch_events_to_clean(credentials, calendars, future_only, args.full_scan)
+    
+    total_deleted = 0
+    for calendar_id, calendar_name in calendars:
+        total_deleted += clean_calendar(service, calendar_id, calendar_name, events_by_calendar.get(calendar_name, []),
+                                        assume_yes, args.verbose)
+    
     # Summary
     logger.info("=" * 80)
     logger.info("CALENDAR CLEANING COMPLETED")
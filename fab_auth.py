@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Shared Google Calendar Credentials
+Loads service account credentials once per process, reuses the signed
+access token across runs until it is close to expiry, builds Calendar
+services on a long-lived HTTP connection, and retries transient API errors
+(including the rows of a batch request)
+
+The Google client libraries are imported on first use so scripts can parse
+arguments and validate configuration without paying their import cost.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: googleapiclient keeps using the stdlib json module
+    orjson = None
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+    from google.oauth2.service_account import Credentials
+
+# Google Calendar Configuration
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+SERVICE_ACCOUNT_FILE = 'sa.json'
+
+# Access token cache (reused while it has more than TOKEN_MIN_LIFETIME left)
+TOKEN_CACHE_FILE = os.path.expanduser(os.getenv('FAB_TOKEN_CACHE_FILE', '~/.cache/fab-events/token.json'))
+TOKEN_MIN_LIFETIME = timedelta(seconds=60)
+
+# Transient Calendar API errors retried with exponential backoff + jitter
+RETRY_STATUSES = (429, 500, 503)
+MAX_TRIES = 5
+MAX_BACKOFF = 32
+
+# Google Calendar API limit per batch request
+BATCH_SIZE = 50
+# Google Calendar API maximum page size for events().list
+MAX_RESULTS = 2500
+
+# Socket timeout for API calls
+HTTP_TIMEOUT = 30
+
+logger = logging.getLogger(__name__)
+
+# Per-thread Calendar services for get_thread_service
+_thread_local = threading.local()
+
+class _OrjsonCompat:
+    """json-module stand-in for googleapiclient that parses responses with orjson
+
+    Request bodies stay on the stdlib encoder: its ASCII-only output (non-ASCII as
+    \\uXXXX) is what the batch serializer's str-length content-length and http.client's
+    Latin-1 body encoding rely on.
+    """
+    
+    decoder = json.decoder
+    JSONDecodeError = json.JSONDecodeError
+    dumps = staticmethod(json.dumps)
+    
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers' except clauses still match
+        return orjson.loads(s)
+
+@lru_cache(maxsize=1)
+def _use_orjson() -> bool:
+    """Point googleapiclient's response JSON parsing at orjson when it is installed"""
+    if orjson is None:
+        return False
+    
+    import googleapiclient.http
+    import googleapiclient.model
+    googleapiclient.http.json = _OrjsonCompat
+    googleapiclient.model.json = _OrjsonCompat
+    return True
+
+def _load_cached_token(credentials: Credentials) -> bool:
+    """Attach a cached access token to the credentials if it is still fresh"""
+    try:
+        with open(TOKEN_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('service_account') != credentials.service_account_email:
+            return False
+        if cached.get('scopes') != SCOPES:
+            return False
+        expiry = datetime.fromisoformat(cached['expiry'])
+        if expiry - datetime.utcnow() <= TOKEN_MIN_LIFETIME:
+            return False
+        # google-auth stores expiry as a naive UTC datetime
+        credentials.token = cached['token']
+        credentials.expiry = expiry
+        return True
+    except (OSError, ValueError, KeyError):
+        return False
+
+def _save_cached_token(credentials: Credentials) -> None:
+    """Persist the current access token and its expiry"""
+    try:
+        os.makedirs(os.path.dirname(TOKEN_CACHE_FILE), exist_ok=True)
+        fd = os.open(TOKEN_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({
+                'service_account': credentials.service_account_email,
+                'scopes': SCOPES,
+                'token': credentials.token,
+                'expiry': credentials.expiry.isoformat(),
+            }, f)
+    except OSError as e:
+        logger.warning(f"Could not write token cache '{TOKEN_CACHE_FILE}': {e}")
+
+@lru_cache(maxsize=1)
+def load_credentials(service_account_file: str = SERVICE_ACCOUNT_FILE) -> Credentials:
+    """Load service account credentials with a valid access token (cached per process)"""
+    from google.auth.transport.requests import Request
+    from google.oauth2.service_account import Credentials
+    
+    credentials = Credentials.from_service_account_file(service_account_file, scopes=SCOPES)
+    if not _load_cached_token(credentials):
+        credentials.refresh(Request())
+        _save_cached_token(credentials)
+    return credentials
+
+def build_calendar_service(credentials: Credentials) -> Resource:
+    """Build a Calendar service on its own keep-alive Http using the bundled discovery document
+
+    httplib2.Http is not thread-safe, so call this once per thread.
+    """
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
+    
+    _use_orjson()
+    http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+    return build('calendar', 'v3', http=http, static_discovery=True)
+
+def get_thread_service(credentials: Credentials) -> Resource:
+    """Return a Calendar service owned by the current thread, building it on first use"""
+    service = getattr(_thread_local, 'service', None)
+    if service is None:
+        service = build_calendar_service(credentials)
+        _thread_local.service = service
+    return service
+
+def is_retryable(error: Exception) -> bool:
+    """True for rate-limit and transient server errors from the Calendar API"""
+    from googleapiclient.errors import HttpError
+    return isinstance(error, HttpError) and error.resp.status in RETRY_STATUSES
+
+def retry_delay(attempt: int, error: Exception | None = None) -> float:
+    """Seconds to wait before retry number attempt, honoring Retry-After when present"""
+    from googleapiclient.errors import HttpError
+    retry_after = error.resp.get('retry-after') if isinstance(error, HttpError) else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return min(MAX_BACKOFF, 2 ** attempt) + random.random()
+
+def execute_with_retry(request, tries: int = MAX_TRIES):
+    """Execute an API request (or batch), retrying 429/500/503 responses"""
+    from googleapiclient.errors import HttpError
+    
+    for attempt in range(tries):
+        try:
+            return request.execute()
+        except HttpError as e:
+            if attempt == tries - 1 or not is_retryable(e):
+                raise
+            delay = retry_delay(attempt, e)
+            logger.warning(f"Calendar API returned {e.resp.status}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+def iter_events(service: Resource, calendar_id: str, fields: str, **params) -> Iterator[Dict]:
+    """Yield events from events().list page by page, following nextPageToken
+
+    fields must include nextPageToken. Each page request is retried on 429/500/503.
+    """
+    page_token = None
+    while True:
+        events_result = execute_with_retry(service.events().list(
+            calendarId=calendar_id,
+            singleEvents=True,
+            maxResults=MAX_RESULTS,
+            fields=fields,
+            pageToken=page_token,
+            **params
+        ))
+        yield from events_result.get('items', [])
+        page_token = events_result.get('nextPageToken')
+        if not page_token:
+            break
+
+def fetch_calendar_index(service: Resource, calendar_id: str, time_min: str, time_max: str, fields: str,
+                         key: Callable[[Dict], Optional[str]]) -> Dict[str, List[Dict]]:
+    """List the events between two RFC3339 times once and group them by key(item)
+
+    Items whose key is empty are left out.
+    """
+    index: Dict[str, List[Dict]] = {}
+    for item in iter_events(service, calendar_id, fields, timeMin=time_min, timeMax=time_max):
+        item_key = key(item)
+        if item_key:
+            index.setdefault(item_key, []).append(item)
+    return index
+
+def batch_upsert(service: Resource, calendar_id: str, ops: List[Tuple[str, Optional[str], Dict]],
+                 log: logging.Logger = logger) -> int:
+    """Insert or update events up to BATCH_SIZE per HTTP request and return how many succeeded
+
+    ops are (title, event_id, body) tuples; an event_id updates that event and None
+    inserts a new one. Rows rejected with 429/500/503 are re-sent in a later batch with
+    backoff, up to MAX_TRIES rounds. Results are logged to the caller's logger.
+    """
+    success_count = 0
+    retry_indexes: List[int] = []
+    # Batch request_id -> (log action, event title)
+    pending: Dict[str, Tuple[str, str]] = {}
+    
+    def _on_upsert(request_id, response, exception):
+        nonlocal success_count
+        action, title = pending[request_id]
+        if exception is None:
+            log.info(f"  [{action}] {title}")
+            success_count += 1
+        elif is_retryable(exception):
+            retry_indexes.append(int(request_id))
+        else:
+            log.error(f"  ❌ ERROR: {title} - {exception}")
+    
+    to_send = list(range(len(ops)))
+    for attempt in range(MAX_TRIES):
+        for offset in range(0, len(to_send), BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_on_upsert)
+            pending.clear()
+            for index in to_send[offset:offset + BATCH_SIZE]:
+                title, event_id, body = ops[index]
+                if event_id:
+                    request = service.events().update(calendarId=calendar_id, eventId=event_id, body=body)
+                    pending[str(index)] = ('UPDATED', title)
+                else:
+                    request = service.events().insert(calendarId=calendar_id, body=body)
+                    pending[str(index)] = ('CREATED', title)
+                # request_id must be unique within a batch, so key it by the op position
+                batch.add(request, request_id=str(index))
+            try:
+                execute_with_retry(batch)
+            except Exception as e:
+                log.error(f"  ❌ ERROR: batch of {len(pending)} events failed - {e}")
+        
+        if not retry_indexes:
+            break
+        to_send = sorted(retry_indexes)
+        retry_indexes.clear()
+        if attempt < MAX_TRIES - 1:
+            delay = retry_delay(attempt)
+            log.warning(f"Retrying {len(to_send)} rate-limited event writes in {delay:.1f}s")
+            time.sleep(delay)
+    else:
+        for index in to_send:
+            log.error(f"  ❌ ERROR: {ops[index][0]} - retries exhausted")
+    
+    return success_count
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Shared FAB Events Script Setup
+Environment loading and queued, buffered logging shared by the entry-point scripts
+"""
+
+import os
+import queue
+import atexit
+import logging
+import importlib
+import threading
+from types import ModuleType
+from datetime import datetime
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from typing import List
+from dotenv import load_dotenv
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_BUFFER_CAPACITY = 1024  # records buffered before the log file is written
+DISCORD_TIMEOUT = 10  # upper bound on a Discord webhook post (seconds)
+IMPORT_TIMEOUT = 30  # seconds a script import check may take before it is reported as hung
+
+# Process start time, shared by log file names and the scripts' startup banners
+RUN_STARTED_AT = datetime.now()
+
+# Loggers of shared modules (retry/backoff and token cache warnings) routed to the script's log
+SHARED_LOGGERS = ('fab_auth',)
+
+# Listeners started by setup_logging, drained by prompt_user
+_log_listeners: List[QueueListener] = []
+# Logger names already configured by setup_logging
+_configured_loggers = set()
+
+def load_env():
+    """Load base .env then override with .env.local if present"""
+    load_dotenv(dotenv_path='.env', override=False)
+    if os.path.exists('.env.local'):
+        load_dotenv(dotenv_path='.env.local', override=True)
+
+def log_to_file_enabled() -> bool:
+    """File logging is on unless FAB_LOG_TO_FILE is 0/false/no"""
+    return os.getenv('FAB_LOG_TO_FILE', '1').lower() not in ('0', 'false', 'no')
+
+def log_to_console_enabled() -> bool:
+    """Console logging is on unless FAB_LOG_TO_CONSOLE is 0/false/no"""
+    return os.getenv('FAB_LOG_TO_CONSOLE', '1').lower() not in ('0', 'false', 'no')
+
+def setup_logging(script_name: str, logger_name: str) -> logging.Logger:
+    """Setup logging to the console and logs/<script_name>_<timestamp>.log
+
+    Records are queued and written by a QueueListener thread, and file writes
+    are buffered until LOG_BUFFER_CAPACITY records, an ERROR, or exit.
+    Each logger is configured once per process, so importing a script again
+    does not open another log file. Records from SHARED_LOGGERS (fab_auth) go to
+    the first script's handlers.
+    """
+    # Create logger
+    logger = logging.getLogger(logger_name)
+    if logger_name in _configured_loggers:
+        return logger
+    _configured_loggers.add(logger_name)
+    logger.setLevel(logging.INFO)
+
+    # Clear any existing handlers
+    logger.handlers.clear()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    handlers: List[logging.Handler] = []
+    if log_to_console_enabled():
+        # Console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    if log_to_file_enabled():
+        # Create logs directory if it doesn't exist
+        os.makedirs('logs', exist_ok=True)
+
+        # File handler with timestamp
+        timestamp = RUN_STARTED_AT.strftime('%Y%m%d_%H%M%S')
+        file_handler = logging.FileHandler(f'logs/{script_name}_{timestamp}.log')
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(formatter)
+
+        # Buffer file writes; ERROR records (and exit) flush the buffer immediately
+        buffered_file_handler = MemoryHandler(LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True)
+        atexit.register(buffered_file_handler.flush)
+        handlers.append(buffered_file_handler)
+
+    # Route records through a queue so console/file writes happen on the listener thread
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    
+    # Shared modules log under their own names; send them to the first script configured in this process
+    for shared_name in SHARED_LOGGERS:
+        shared_logger = logging.getLogger(shared_name)
+        if not shared_logger.handlers:
+            shared_logger.setLevel(logging.INFO)
+            shared_logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _log_listeners.append(listener)
+    # Registered after the buffer flush so it runs first at exit (atexit is LIFO)
+    atexit.register(listener.stop)
+
+    return logger
+
+def prompt_user(prompt: str) -> str:
+    """Drain queued log records before prompting so the prompt appears after them"""
+    for listener in _log_listeners:
+        listener.stop()
+        listener.start()
+    return input(prompt)
+
+def import_with_timeout(module_name: str, timeout: float = IMPORT_TIMEOUT) -> ModuleType:
+    """Import a module on a daemon thread, raising TimeoutError if it takes longer than timeout
+
+    Whatever the import raises (including SystemExit) is re-raised in the caller. A hung
+    import is left running on its daemon thread so it cannot block interpreter exit.
+    """
+    outcome = {}
+    
+    def _import():
+        try:
+            outcome['module'] = importlib.import_module(module_name)
+        except BaseException as e:
+            outcome['error'] = e
+    
+    thread = threading.Thread(target=_import, name=f"import-{module_name}", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"import of '{module_name}' did not finish within {timeout:g}s")
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['module']
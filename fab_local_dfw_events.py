@@ -8,19 +8,25 @@ import requests
 import re
 import json
 import time
-import logging
 import os
-from typing import List, Dict, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Iterator, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-from googleapiclient.discovery import build
-from google.oauth2.service_account import Credentials
-from dotenv import load_dotenv
+from fab_auth import SERVICE_ACCOUNT_FILE, batch_upsert, build_calendar_service, fetch_calendar_index, load_credentials
+from fab_common import RUN_STARTED_AT, load_env, setup_logging
 import hashlib
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
 # Load env: base .env then override with .env.local if present
-load_dotenv(dotenv_path='.env', override=False)
-if os.path.exists('.env.local'):
-    load_dotenv(dotenv_path='.env.local', override=True)
+load_env()
 
 # Configuration constants
 EVENTS_API_URL = os.getenv('FAB_LOCAL_API_URL', 'https://gem.fabtcg.com/api/v1/locator/events/')
@@ -29,68 +35,76 @@ SEARCH_LOCATION = os.getenv('SEARCH_LOCATION', 'Fort Worth, TX 76117, USA')
 MAX_DISTANCE_COMPETITIVE = int(os.getenv('MAX_DISTANCE_COMPETITIVE', '250'))
 MAX_DISTANCE_PRERELEASE = int(os.getenv('MAX_DISTANCE_PRERELEASE', '100'))
 SEARCH_DISTANCE_COMPETITIVE = int(os.getenv('SEARCH_DISTANCE_COMPETITIVE', str(MAX_DISTANCE_COMPETITIVE)))
-REQUEST_DELAY = int(os.getenv('REQUEST_DELAY', '1'))  # seconds between requests
+REQUEST_DELAY = int(os.getenv('REQUEST_DELAY', '1'))  # seconds between request starts
+MAX_FETCH_WORKERS = 8  # concurrent page fetches per event type
+API_POOL_SIZE = 16  # keep-alive connections kept open to the locator API host
+API_MAX_RETRIES = 4  # retries per API request on connection errors and 429/5xx responses
 DISTANCE_UNIT = os.getenv('DISTANCE_UNIT', 'mi').lower()
 if DISTANCE_UNIT not in ('mi', 'km'):
     DISTANCE_UNIT = 'mi'
 PRUNE_MISSING_FUTURE = os.getenv('PRUNE_MISSING_FUTURE', '0').lower() in ('1', 'true', 'yes')
 FUTURE_CLEAN_DAYS = int(os.getenv('FUTURE_CLEAN_DAYS', '365'))
+FILTER_CACHE_TTL = int(os.getenv('FILTER_CACHE_TTL', '86400'))  # seconds to reuse cached event type filters (0 disables)
+# Keyed by API URL + language so changing either invalidates the cache
+FILTER_CACHE_FILE = os.path.join(
+    'data', f"event_type_filters_{hashlib.md5(f'{EVENTS_API_URL}|{API_LANGUAGE}'.encode('utf-8')).hexdigest()[:12]}.json")
 
 DISTANCE_CONVERSION = 1.609344  # miles <-> km
 
-TARGET_EVENT_TYPE_MATCHERS: List[Tuple[str, List[str]]] = [
-    ('Pro Quest+', ['pro quest+']),
-    ('Pro Quest', ['pro quest']),
-    ('Skirmish', ['skirmish']),
-    ('Road to Nationals', ['road to nationals']),
-    ('Prerelease', ['prerelease', 'pre-release', 'pre release']),
-    ('Battlegrounds', ['battlegrounds']),
-]
+# Ordinal suffix by day of month (index 0 unused)
+DAY_SUFFIXES = tuple('th' if 11 <= day <= 13 else {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th') for day in range(32))
+
+MONTH_NUMBERS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+# Local date text like "Sat 4th Oct" / "Sun 21st Sep"
+LOCAL_DATE_RE = re.compile(r'([A-Za-z]{3})\s+(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]{3,4})')
+# Distance rank prefix added by apply_distance_rank_titles ("01 • ")
+RANK_PREFIX_RE = re.compile(r'^\d{2}\s+(?:•\s+)?')
+
+# (label, title substrings) in priority order; patterns are lowercased once here
+TARGET_EVENT_TYPE_MATCHERS: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+    (label, tuple(pattern.lower() for pattern in patterns))
+    for label, patterns in (
+        ('Pro Quest+', ('pro quest+',)),
+        ('Pro Quest', ('pro quest',)),
+        ('Skirmish', ('skirmish',)),
+        ('Road to Nationals', ('road to nationals',)),
+        ('Prerelease', ('prerelease', 'pre-release', 'pre release')),
+        ('Battlegrounds', ('battlegrounds',)),
+    )
+)
+
+# Google Calendar color ID per event type - soft, easy-on-the-eyes colors
+EVENT_COLORS = {
+    'Pro Quest': '7',      # Soft Pink (unused elsewhere)
+    'Pro Quest+': '7',     # Soft Pink
+    'Skirmish': '9',       # Soft Sage Green (different from major events orange)
+    'Road to Nationals': '10', # Soft Peach (different from major events green)
+    'Prerelease': '1',     # Lavender
+    'Pre-Release': '1',    # Lavender
+    'Pre Release': '1',    # Lavender
+    'Battlegrounds': '4',  # Flamingo
+}
+
+# Summaries that mark a calendar entry as managed by this sync, matched in one scan
+MANAGED_EVENT_KEYWORDS = ('pro quest', 'skirmish', 'road to nationals', 'prerelease', 'pre-release', 'pre release', 'battlegrounds')
+MANAGED_EVENT_RE = re.compile('|'.join(re.escape(keyword) for keyword in MANAGED_EVENT_KEYWORDS), re.IGNORECASE)
 
 # Google Calendar Configuration
-SCOPES = ['https://www.googleapis.com/auth/calendar']
-SERVICE_ACCOUNT_FILE = 'sa.json'
 LOCAL_CALENDAR_ID = os.getenv('LOCAL_CALENDAR_ID')  # Your new local events calendar ID
-
-# Configure logging to both console and file
-def setup_logging():
-    """Setup logging to both console and file"""
-    # Create logs directory if it doesn't exist
-    os.makedirs('logs', exist_ok=True)
-    
-    # Create logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)
-    
-    # Clear any existing handlers
-    logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(console_formatter)
-    
-    # File handler with timestamp
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    file_handler = logging.FileHandler(f'logs/fab_local_dfw_events_{timestamp}.log')
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(file_formatter)
-    
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
-    return logger
+# Fields the sync reads when matching scraped events to calendar entries
+CALENDAR_INDEX_FIELDS = 'items(id,summary,start),nextPageToken'
 
 # Setup logging
-logger = setup_logging()
+logger = setup_logging('fab_local_dfw_events', __name__)
 
 # Log script start
 logger.info("=" * 80)
 logger.info("FAB Local DFW Events Scraper Started")
-logger.info(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+logger.info(f"Timestamp: {RUN_STARTED_AT.strftime('%Y-%m-%d %H:%M:%S')}")
 logger.info(f"Events API URL: {EVENTS_API_URL}")
 logger.info(f"Search Location: {SEARCH_LOCATION}")
 logger.info(f"Max Distance (Competitive): {MAX_DISTANCE_COMPETITIVE} {DISTANCE_UNIT}")
@@ -100,15 +114,54 @@ logger.info(f"Prune Missing Future Events: {PRUNE_MISSING_FUTURE}")
 logger.info(f"Future Cleanup Window: {FUTURE_CLEAN_DAYS} days")
 logger.info("=" * 80)
 
+class RequestRateLimiter:
+    """Space request starts at least `interval` seconds apart across threads"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+    
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+def create_api_session() -> requests.Session:
+    """Create a keep-alive session shared by all page fetches (one host, pooled connections)
+
+    Transient failures are retried with exponential backoff, honoring Retry-After.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=API_MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=API_POOL_SIZE, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept-Language': API_LANGUAGE
+    })
+    return session
+
+API_SESSION = create_api_session()
+API_RATE_LIMITER = RequestRateLimiter(REQUEST_DELAY)
+
 def fetch_events_api(params: Dict) -> Optional[Dict]:
     """Fetch event data from the FAB locator API."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept-Language': API_LANGUAGE
-        }
-        response = requests.get(EVENTS_API_URL, headers=headers, params=params, timeout=30)
+        API_RATE_LIMITER.wait()
+        response = API_SESSION.get(EVENTS_API_URL, params=params, timeout=30)
         response.raise_for_status()
+        if orjson is not None:
+            return orjson.loads(response.content)
         return response.json()
     except requests.RequestException as e:
         logger.error(f"Network error fetching events: {e}")
@@ -146,15 +199,7 @@ def normalize_distance_value(distance: Optional[float], unit: Optional[str]) ->
     return distance, unit
 
 def format_day_suffix(day: int) -> str:
-    if 11 <= day <= 13:
-        return "th"
-    if day % 10 == 1:
-        return "st"
-    if day % 10 == 2:
-        return "nd"
-    if day % 10 == 3:
-        return "rd"
-    return "th"
+    return DAY_SUFFIXES[day]
 
 def format_date_text(dt: datetime) -> str:
     day_name = dt.strftime('%a')
@@ -162,10 +207,16 @@ def format_date_text(dt: datetime) -> str:
     suffix = format_day_suffix(dt.day)
     return f"{day_name} {dt.day}{suffix} {month}"
 
+def format_iso_date(dt: datetime) -> str:
+    """YYYY-MM-DD without going through strftime"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
 def format_time_text(dt: datetime) -> str:
     return dt.strftime('%I:%M %p').lstrip('0')
 
+@lru_cache(maxsize=4096)
 def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an API ISO timestamp (memoized: each start_time is parsed by several passes)"""
     if not value:
         return None
     try:
@@ -189,41 +240,100 @@ def build_event_type_map(event_types: List[Dict]) -> Dict[int, str]:
                 break
     return type_map
 
+def load_cached_event_type_filters() -> Optional[List[Dict]]:
+    """Return event type filters cached on disk if younger than FILTER_CACHE_TTL."""
+    if FILTER_CACHE_TTL <= 0:
+        return None
+    try:
+        if time.time() - os.path.getmtime(FILTER_CACHE_FILE) >= FILTER_CACHE_TTL:
+            return None
+        with open(FILTER_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        return cached if isinstance(cached, list) and cached else None
+    except (OSError, ValueError):
+        return None
+
+def save_cached_event_type_filters(event_types: List[Dict]) -> None:
+    """Persist event type filters for later runs."""
+    if FILTER_CACHE_TTL <= 0:
+        return
+    try:
+        os.makedirs(os.path.dirname(FILTER_CACHE_FILE), exist_ok=True)
+        with open(FILTER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(event_types, f, ensure_ascii=False)
+    except OSError as e:
+        logger.warning(f"Could not write event type filter cache '{FILTER_CACHE_FILE}': {e}")
+
 def fetch_event_type_filters() -> List[Dict]:
-    """Fetch available event type filters from the API."""
+    """Fetch available event type filters from the API (cached on disk for FILTER_CACHE_TTL)."""
+    cached = load_cached_event_type_filters()
+    if cached is not None:
+        logger.info(f"Using cached event type filters from {FILTER_CACHE_FILE}")
+        return cached
+
     data = fetch_events_api({'mode': 'event', 'page': 1})
     if not data:
         return []
     filters = data.get('filters') or {}
-    return filters.get('event_types') or []
+    event_types = filters.get('event_types') or []
+    if event_types:
+        save_cached_event_type_filters(event_types)
+    return event_types
+
+def count_result_pages(data: Dict) -> Optional[int]:
+    """Total pages for a paged API response, or None if the response has no usable count."""
+    results = data.get('results') or []
+    count = data.get('count')
+    if not results or not isinstance(count, int):
+        return None
+    return max(1, -(-count // len(results)))
+
+def fetch_events_for_type(type_id: int, search: str, distance: int) -> Iterator[Dict]:
+    """Yield all events for a given event type, page by page.
+
+    Page 1 gives the total page count; the remaining pages are fetched concurrently
+    and yielded in page order as they arrive.
+    """
+    params: Dict[str, object] = {'mode': 'event'}
+    if search:
+        params['search'] = search
+    if distance:
+        params['distance'] = distance
+    if type_id:
+        params['type'] = type_id
+
+    data = fetch_events_api({**params, 'page': 1})
+    if not data:
+        return
+    yield from data.get('results') or []
+    if not data.get('next'):
+        return
+
+    total_pages = count_result_pages(data)
+    if total_pages:
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, max(1, total_pages - 1))) as executor:
+            pages = executor.map(lambda page: fetch_events_api({**params, 'page': page}), range(2, total_pages + 1))
+            for page_data in pages:
+                if page_data:
+                    yield from page_data.get('results') or []
+        return
 
-def fetch_events_for_type(type_id: int, search: str, distance: int) -> List[Dict]:
-    """Fetch all events for a given event type with paging."""
-    events: List[Dict] = []
-    page = 1
+    # No count in the response: follow next links one page at a time
+    page = 2
     while True:
-        params: Dict[str, object] = {'mode': 'event', 'page': page}
-        if search:
-            params['search'] = search
-        if distance:
-            params['distance'] = distance
-        if type_id:
-            params['type'] = type_id
-        data = fetch_events_api(params)
+        data = fetch_events_api({**params, 'page': page})
         if not data:
             break
-        results = data.get('results') or []
-        events.extend(results)
+        yield from data.get('results') or []
         if not data.get('next'):
             break
         page += 1
-        time.sleep(REQUEST_DELAY)
-    return events
 
 def build_event_data(item: Dict, event_type: str) -> Dict:
     """Normalize API event data to the local event schema."""
     store_name = item.get('organiser_name') or item.get('nickname') or "Unknown Store"
-    start_dt = parse_iso_datetime(item.get('start_time'))
+    start_time = item.get('start_time')
+    start_dt = parse_iso_datetime(start_time)
     date_text = format_date_text(start_dt) if start_dt else ''
     time_text = format_time_text(start_dt) if start_dt else ''
 
@@ -242,10 +352,10 @@ def build_event_data(item: Dict, event_type: str) -> Dict:
         'time': time_text,
         'format': item.get('format_name'),
         'location': item.get('address'),
-        'distance': str(distance_value) if distance_value is not None else '0',
+        'distance': distance_value if distance_value is not None else 0.0,
         'distance_unit': distance_unit,
         'url': item.get('event_link'),
-        'start_time': item.get('start_time')
+        'start_time': start_time
     }
 
     return event_data
@@ -278,9 +388,7 @@ def apply_distance_rank_titles(events: List[Dict]) -> None:
 
 def is_managed_local_event(summary: str) -> bool:
     """Limit cleanup to events that look like FAB local sync entries."""
-    summary_lower = (summary or '').lower()
-    keywords = ['pro quest', 'pro quest+', 'skirmish', 'road to nationals', 'prerelease', 'pre-release', 'pre release', 'battlegrounds']
-    return any(keyword in summary_lower for keyword in keywords)
+    return MANAGED_EVENT_RE.search(summary or '') is not None
 
 def build_event_key(title: str, date_value: str) -> str:
     return f"{title}|{date_value}"
@@ -288,13 +396,13 @@ def build_event_key(title: str, date_value: str) -> str:
 def normalize_calendar_summary(summary: str) -> str:
     if not summary:
         return ''
-    return re.sub(r'^\d{2}\s+(?:•\s+)?', '', summary).strip()
+    return RANK_PREFIX_RE.sub('', summary).strip()
 
 def event_date_key_from_event(event: Dict) -> Optional[str]:
     event_date = parse_local_event_date(event.get('date_text', ''), event.get('start_time'))
     if not event_date:
         return None
-    return event_date.strftime('%Y-%m-%d')
+    return format_iso_date(event_date)
 
 def event_date_key_from_calendar_item(item: Dict) -> Optional[str]:
     start = item.get('start') or {}
@@ -304,8 +412,16 @@ def event_date_key_from_calendar_item(item: Dict) -> Optional[str]:
         return start['dateTime'][:10]
     return None
 
+def is_within_max_distance(item: Dict, event_type: str) -> bool:
+    """Check a raw API item against the distance limit for its event type (unknown distance passes)."""
+    distance, _unit = normalize_distance_value(item.get('distance'), item.get('distance_unit'))
+    if distance is None:
+        return True
+    max_distance = MAX_DISTANCE_PRERELEASE if event_type == 'Prerelease' else MAX_DISTANCE_COMPETITIVE
+    return round(distance, 2) <= max_distance
+
 def scrape_specific_event_types():
-    """Fetch competitive events using the locator API."""
+    """Fetch competitive events within range using the locator API."""
     event_type_filters = fetch_event_type_filters()
     if not event_type_filters:
         return []
@@ -315,47 +431,33 @@ def scrape_specific_event_types():
         logger.warning("No matching competitive event types found in API filters.")
         return []
 
-    all_events: List[Dict] = []
-    for type_id, category in type_map.items():
+    def fetch_category(type_id: int, category: str) -> List[Dict]:
         if category == 'Prerelease':
             search_distance = MAX_DISTANCE_PRERELEASE
         else:
             search_distance = SEARCH_DISTANCE_COMPETITIVE
         distance = normalize_distance_for_api(search_distance)
-        results = fetch_events_for_type(type_id, SEARCH_LOCATION, distance)
-        for item in results:
-            all_events.append(build_event_data(item, category))
-
-    # Remove duplicates based on API event ID
-    unique_events = []
-    seen_events = set()
-    for event in all_events:
-        event_id = event.get('event_id')
-        event_key = event_id if event_id is not None else f"{event.get('store_name', '')}_{event.get('date_text', '')}_{event.get('event_type', '')}"
-        if event_key not in seen_events:
-            seen_events.add(event_key)
-            unique_events.append(event)
-
-    return unique_events
-
-def filter_events_by_distance(events):
-    """Filter events by distance (Prerelease: 100 miles, others: 250 miles)"""
-    filtered_events = []
-    
-    for event in events:
-        try:
-            distance = float(event.get('distance', '0'))
-            event_type = event.get('event_type', '')
-            
-            # Apply distance limits based on event type
-            max_distance = MAX_DISTANCE_PRERELEASE if event_type == 'Prerelease' else MAX_DISTANCE_COMPETITIVE
-            if distance <= max_distance:
-                filtered_events.append(event)
-        except (ValueError, TypeError):
-            # If distance parsing fails, include the event (distance filtering will be skipped)
-            filtered_events.append(event)
-    
-    return filtered_events
+        # Drained on the worker thread so each type's pages download in parallel
+        return list(fetch_events_for_type(type_id, SEARCH_LOCATION, distance))
+
+    # Event types are fetched concurrently; results are merged in type_map order.
+    # Duplicates are dropped by API event ID (store/date/type when the ID is missing)
+    # as they arrive, so repeated items are never normalized.
+    unique_events: Dict[object, Dict] = {}
+    with ThreadPoolExecutor(max_workers=len(type_map)) as executor:
+        categories = list(type_map.values())
+        for category, results in zip(categories, executor.map(fetch_category, type_map.keys(), categories)):
+            for item in results:
+                event_id = item.get('id')
+                if event_id is not None and event_id in unique_events:
+                    continue
+                if not is_within_max_distance(item, category):
+                    continue
+                event = build_event_data(item, category)
+                event_key = event_id if event_id is not None else (event['store_name'], event['date_text'], event['event_type'])
+                unique_events.setdefault(event_key, event)
+
+    return list(unique_events.values())
 
 def display_results(events):
     """Display results in a clean format"""
@@ -371,24 +473,22 @@ def display_results(events):
         event_type = event.get('event_type', 'Unknown')
         events_by_type.setdefault(event_type, []).append(event)
     
-    # Display organized by type
+    # Display organized by type, written with a single print
+    lines = []
     for event_type in sorted(events_by_type.keys()):
         type_events = events_by_type[event_type]
-        print(f"{event_type.upper()}: {len(type_events)} events")
+        lines.append(f"{event_type.upper()}: {len(type_events)} events")
         
         for event in type_events:
-            format_info = f" ({event.get('format', 'Unknown')})" if event.get('format') else ""
-            print(f"  {event.get('store_name', 'Unknown Store')} - {event.get('date_text', 'Unknown')} {event.get('time', '')}{format_info}")
+            event_format = event.get('format')
+            format_info = f" ({event_format})" if event_format else ""
+            lines.append(f"  {event.get('store_name', 'Unknown Store')} - {event.get('date_text', 'Unknown')} {event.get('time', '')}{format_info}")
+    print("\n".join(lines))
 
 def get_competitive_events():
     """API-ready function to get all competitive events"""
-    events = scrape_specific_event_types()
-    if not events:
-        return []
-    
-    # Filter by distance
-    filtered_events = filter_events_by_distance(events)
-    return filtered_events
+    # Distance limits are applied while scraping, before events are built
+    return scrape_specific_event_types()
 
 def get_competitive_events_by_type(event_type=None):
     """Get events filtered by specific type (optional)"""
@@ -397,28 +497,38 @@ def get_competitive_events_by_type(event_type=None):
         events = [e for e in events if e.get('event_type', '').lower() == event_type.lower()]
     return events
 
+# Calendar service reused by health_check() and main() in the same process
+_calendar_service = None
+
 def setup_google_calendar():
-    """Set up Google Calendar service"""
+    """Set up Google Calendar service (built and probed once per process)"""
+    global _calendar_service
+    if _calendar_service is not None:
+        return _calendar_service
+    
     try:
         if not LOCAL_CALENDAR_ID:
             logger.error("LOCAL_CALENDAR_ID not found in environment variables")
             return None
             
-        credentials = Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-        service = build('calendar', 'v3', credentials=credentials)
+        credentials = load_credentials(SERVICE_ACCOUNT_FILE)
+        service = build_calendar_service(credentials)
         
         # Test connection
         calendar = service.calendars().get(calendarId=LOCAL_CALENDAR_ID).execute()
         logger.info(f"Connected to Google Calendar: {calendar['summary']}")
+        _calendar_service = service
         return service
         
     except Exception as e:
         logger.error(f"Failed to setup Google Calendar: {e}")
         return None
 
-def parse_local_event_date(date_text, start_time: Optional[str] = None):
-    """Parse local event date format (e.g., 'Sat 4th Oct') or ISO start_time to datetime."""
+def parse_local_event_date(date_text, start_time: Optional[str] = None, now: Optional[datetime] = None):
+    """Parse local event date format (e.g., 'Sat 4th Oct') or ISO start_time to datetime.
+
+    Pass `now` to reuse one clock reading across a loop of events.
+    """
     try:
         if start_time:
             iso_dt = parse_iso_datetime(start_time)
@@ -426,28 +536,22 @@ def parse_local_event_date(date_text, start_time: Optional[str] = None):
                 return iso_dt
 
         # Handle formats like "Sat 4th Oct", "Sun 21st Sep"
-        date_pattern = r'([A-Za-z]{3})\s+(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]{3,4})'
-        match = re.search(date_pattern, date_text)
+        match = LOCAL_DATE_RE.search(date_text)
         
         if match:
             day_name, day_num, month = match.groups()
             day_num = int(day_num)
             
-            # Map month abbreviations to numbers
-            month_map = {
-                'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-            }
-            
-            month_num = month_map.get(month, 1)
-            current_year = datetime.now().year
+            month_num = MONTH_NUMBERS.get(month, 1)
+            if now is None:
+                now = datetime.now()
             
             # Create datetime object
-            event_date = datetime(current_year, month_num, day_num)
+            event_date = datetime(now.year, month_num, day_num)
             
             # If the date is in the past, assume next year
-            if event_date < datetime.now():
-                event_date = datetime(current_year + 1, month_num, day_num)
+            if event_date < now:
+                event_date = datetime(now.year + 1, month_num, day_num)
             
             return event_date
             
@@ -477,8 +581,8 @@ def create_calendar_event(service, event):
             description_parts.append(f"Format: {event['format']}")
         if event.get('location'):
             description_parts.append(f"Address: {event['location']}")
-        if event.get('distance'):
-            description_parts.append(f"Distance: {event['distance']} {event.get('distance_unit', 'mi')}")
+        if event.get('distance') is not None:
+            description_parts.append(f"Distance: {event['distance']:g} {event.get('distance_unit', 'mi')}")
         
         description = "\n".join(description_parts) if description_parts else "Local FAB Event"
         
@@ -488,11 +592,11 @@ def create_calendar_event(service, event):
             'location': event.get('location', ''),
             'description': description,
             'start': {
-                'date': start_date.strftime('%Y-%m-%d'),
+                'date': format_iso_date(start_date),
                 'timeZone': 'America/Chicago',  # DFW timezone
             },
             'end': {
-                'date': end_date.strftime('%Y-%m-%d'),
+                'date': format_iso_date(end_date),
                 'timeZone': 'America/Chicago',
             },
             'colorId': get_event_color(event.get('event_type', ''))
@@ -506,17 +610,19 @@ def create_calendar_event(service, event):
 
 def get_event_color(event_type):
     """Get Google Calendar color ID for event type - using soft, easy-on-the-eyes colors"""
-    color_map = {
-        'Pro Quest': '7',      # Soft Pink (unused elsewhere)
-        'Pro Quest+': '7',     # Soft Pink
-        'Skirmish': '9',       # Soft Sage Green (different from major events orange)
-        'Road to Nationals': '10', # Soft Peach (different from major events green)
-        'Prerelease': '1',     # Lavender
-        'Pre-Release': '1',    # Lavender
-        'Pre Release': '1',    # Lavender
-        'Battlegrounds': '4',  # Flamingo
-    }
-    return color_map.get(event_type, '1')  # Default to gray
+    return EVENT_COLORS.get(event_type, '1')  # Default to gray
+
+def find_matching_calendar_item(event: Dict, items: List[Dict]) -> Optional[Dict]:
+    """Find the calendar entry for a local event among the entries on its date."""
+    title = event.get('title', '')
+    base_title = event.get('base_title', '')
+    for item in items:
+        summary = normalize_calendar_summary(item.get('summary', ''))
+        if summary == title or summary == base_title:
+            return item
+        if base_title and summary.endswith(base_title):
+            return item
+    return None
 
 def sync_events_to_calendar(service, events):
     """Sync local events to Google Calendar"""
@@ -528,51 +634,36 @@ def sync_events_to_calendar(service, events):
 
     logger.info(f"Syncing {len(events)} local events to Google Calendar...")
     
-    success_count = 0
+    pending = []
     for event in events:
         calendar_event = create_calendar_event(service, event)
         if calendar_event:
-            try:
-                # Check if event already exists
-                existing_events = service.events().list(
-                    calendarId=LOCAL_CALENDAR_ID,
-                    q=event.get('base_title', event.get('title', '')),
-                    timeMin=calendar_event['start']['date'] + 'T00:00:00Z',
-                    timeMax=calendar_event['end']['date'] + 'T00:00:00Z'
-                ).execute()
-
-                matching_event = None
-                for item in existing_events.get('items', []):
-                    summary = normalize_calendar_summary(item.get('summary', ''))
-                    base_title = event.get('base_title', '')
-                    if summary == event.get('title', '') or summary == base_title:
-                        matching_event = item
-                        break
-                    if base_title and summary.endswith(base_title):
-                        matching_event = item
-                        break
-
-                if matching_event:
-                    # Update existing event
-                    event_id = matching_event['id']
-                    updated_event = service.events().update(
-                        calendarId=LOCAL_CALENDAR_ID,
-                        eventId=event_id,
-                        body=calendar_event
-                    ).execute()
-                    logger.info(f"  [UPDATED] {event.get('title', 'Unknown')}")
-                else:
-                    # Create new event
-                    created_event = service.events().insert(
-                        calendarId=LOCAL_CALENDAR_ID,
-                        body=calendar_event
-                    ).execute()
-                    logger.info(f"  [CREATED] {event.get('title', 'Unknown')}")
-                
-                success_count += 1
-                
-            except Exception as e:
-                logger.error(f"  ❌ ERROR: {event.get('title', 'Unknown')} - {e}")
+            pending.append((event, calendar_event))
+    if not pending:
+        logger.info("Successfully synced 0 local events to calendar")
+        return
+
+    # One list call for the whole sync window instead of one per event
+    try:
+        existing_by_date = fetch_calendar_index(
+            service,
+            LOCAL_CALENDAR_ID,
+            min(calendar_event['start']['date'] for _, calendar_event in pending) + 'T00:00:00Z',
+            max(calendar_event['end']['date'] for _, calendar_event in pending) + 'T00:00:00Z',
+            CALENDAR_INDEX_FIELDS,
+            event_date_key_from_calendar_item
+        )
+    except Exception as e:
+        logger.error(f"Failed to fetch existing calendar events: {e}")
+        return
+
+    # Update the entry already on the event's date, or insert a new one
+    ops = []
+    for event, calendar_event in pending:
+        matching_event = find_matching_calendar_item(event, existing_by_date.get(calendar_event['start']['date'], []))
+        ops.append((event.get('title', 'Unknown'), matching_event['id'] if matching_event else None, calendar_event))
+    
+    success_count = batch_upsert(service, LOCAL_CALENDAR_ID, ops, logger)
     
     logger.info(f"Successfully synced {success_count} local events to calendar")
 
@@ -687,19 +778,23 @@ def main():
     try:
         os.makedirs('data', exist_ok=True)
         records = []
-        now_iso = datetime.utcnow().replace(microsecond=0).isoformat() + 'Z'
+        # Read the clocks once for the whole loop
+        local_now = datetime.now()
+        utc_now = datetime.utcnow()
+        now_iso = utc_now.replace(microsecond=0).isoformat() + 'Z'
+        fallback_starts_at = utc_now.strftime('%Y-%m-%dT00:00:00Z')
         for e in events:
             base = f"{LOCAL_CALENDAR_ID}:{e.get('title','')}:{e.get('location','') or e.get('store_name','')}:{e.get('date_text','')}"
             event_id = hashlib.sha1(base.encode('utf-8')).hexdigest()
             # Parse start date using the local parser
             try:
-                start_dt = parse_local_event_date(e.get('date_text', '') or '', e.get('start_time'))
+                start_dt = parse_local_event_date(e.get('date_text', '') or '', e.get('start_time'), local_now)
             except Exception:
                 start_dt = None
             if start_dt:
                 starts_at = start_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
             else:
-                starts_at = datetime.utcnow().strftime('%Y-%m-%dT00:00:00Z')
+                starts_at = fallback_starts_at
             records.append({
                 'event_id': event_id,
                 'calendar_id': str(LOCAL_CALENDAR_ID) if LOCAL_CALENDAR_ID else 'local',
@@ -711,8 +806,12 @@ def main():
                 'location': e.get('location') or e.get('store_name') or None,
             })
         out_path = os.path.join('data', 'dfw_events.json')
-        with open(out_path, 'w', encoding='utf-8') as f:
-            json.dump(records, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(out_path, 'wb') as f:
+                f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2))
+        else:
+            with open(out_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f, ensure_ascii=False, indent=2)
         logger.info(f"Wrote {len(records)} events to {out_path}")
     except Exception as write_err:
         logger.error(f"Failed to write JSON to data/: {write_err}")
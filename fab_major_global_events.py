@@ -4,38 +4,47 @@ FAB Events Calendar Sync - Final Version
 Combines working parsing logic with Google Calendar API integration
 """
 
+from __future__ import annotations
+
 # Standard library imports
 import os
 import re
 import json
 import time
-import logging
 import unicodedata
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Iterator, Optional, Tuple
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 # Third-party imports
 import requests
-from bs4 import BeautifulSoup
-from googleapiclient.discovery import build
-from google.oauth2.service_account import Credentials
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, Tag
+from fab_auth import SERVICE_ACCOUNT_FILE, batch_upsert, build_calendar_service, fetch_calendar_index, load_credentials
+from fab_common import RUN_STARTED_AT, load_env, setup_logging
 import hashlib
 
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:  # optional: fall back to the pure-Python parser
+    HTML_PARSER = 'html.parser'
+
 # Load env: base .env then override with .env.local if present
-load_dotenv(dotenv_path='.env', override=False)
-if os.path.exists('.env.local'):
-    load_dotenv(dotenv_path='.env.local', override=True)
+load_env()
 
 # Configuration constants
 FAB_GLOBAL_URL = os.getenv('FAB_GLOBAL_URL', 'https://fabtcg.com/en/organised-play/')
 FAB_LOCAL_URL = os.getenv('FAB_LOCAL_URL', 'https://fabtcg.com/en/events/')
 
 # Google Calendar Configuration
-SCOPES = ['https://www.googleapis.com/auth/calendar']
-SERVICE_ACCOUNT_FILE = 'sa.json'
 # Prefer GLOBAL_CALENDAR_ID; fallback to legacy CALENDAR_ID for compatibility
 CALENDAR_ID = os.getenv('GLOBAL_CALENDAR_ID') or os.getenv('CALENDAR_ID')
+# Fields the sync compares when deciding whether an existing entry needs an update
+CALENDAR_INDEX_FIELDS = 'items(id,summary,location,description,colorId,start,end),nextPageToken'
 
 # Event filtering configuration
 INCLUDE_GLOBAL_MAJORS = os.getenv('INCLUDE_GLOBAL_MAJORS', 'true').lower() == 'true'
@@ -45,45 +54,69 @@ USER_LOCATION = os.getenv('USER_LOCATION', 'Seattle, WA')  # Adjust to your loca
 PRUNE_MISSING_FUTURE = os.getenv('PRUNE_MISSING_FUTURE', 'true').lower() == 'true'
 FUTURE_CLEAN_DAYS = int(os.getenv('FUTURE_CLEAN_DAYS', '365'))
 
-# Configure logging to both console and file
-def setup_logging():
-    """Setup logging to both console and file"""
-    # Create logs directory if it doesn't exist
-    os.makedirs('logs', exist_ok=True)
-    
-    # Create logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)
-    
-    # Clear any existing handlers
-    logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(console_formatter)
-    
-    # File handler with timestamp
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    file_handler = logging.FileHandler(f'logs/fab_major_global_events_{timestamp}.log')
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(file_formatter)
-    
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
-    return logger
+# Pooled keep-alive connections for page fetches
+PAGE_POOL_CONNECTIONS = 4
+PAGE_POOL_SIZE = 8
+
+# Date ranges, with or without a year:
+#   Aug/August 15-17, 2025 | Aug 15 - 17 2025 | Oct 31 - Nov 2, 2025 | Oct 31 - Nov 2
+# A single-month range is only accepted with a year
+DATE_RE = re.compile(
+    r'([A-Za-z]{3,9}\s+\d{1,2}\s*-\s*'
+    r'(?:\d{1,2},?\s+\d{4}'                        # single month
+    r'|[A-Za-z]{3,9}\s+\d{1,2}(?:,?\s+\d{4})?))'   # cross-month
+)
+
+# Any event type followed by its location, e.g. "Calling: Seattle", "Battle Hardened: Seoul"
+EVENT_MATCH_RE = re.compile(r'(Battle Hardened|Calling|World Championship|National Championship|Pro Tour|World Premiere):\s*([^,\n]+)')
+# Event markers that make an HTML block worth parsing (World Premiere blocks are left to the text search)
+EVENT_MARKER_RE = re.compile(r'(?:Calling|Battle Hardened|World Championship|National Championship|Pro Tour):')
+
+# HTML blocks scanned for events by the structure search
+BLOCK_TAGS = ('div', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Date part helpers
+YEAR_RE = re.compile(r'(\d{4})')
+SINGLE_MONTH_RE = re.compile(r'([A-Za-z]{3,9})\s+(\d{1,2})\s*-\s*(\d{1,2})')
+CROSS_MONTH_RE = re.compile(r'([A-Za-z]{3,9})\s+(\d{1,2})\s*-\s*([A-Za-z]{3,9})\s+(\d{1,2})')
+
+# Month name/abbreviation -> month number
+MONTH_NAMES = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+    'January': 1, 'February': 2, 'March': 3, 'April': 4,
+    'June': 6, 'July': 7, 'August': 8, 'September': 9,
+    'October': 10, 'November': 11, 'December': 12
+}
+
+# Google Calendar color IDs by event type:
+# 1=Red, 2=Orange, 3=Yellow, 4=Green, 5=Blue, 6=Purple, 7=Pink, 8=Gray, 9=Brown, 10=Default
+EVENT_COLORS = {
+    'World Championship': '11',     # Tomato Red - Tier 1 events (highest)
+    'National Championship': '11',  # Tomato Red - Tier 1 events
+    'Pro Tour': '11',               # Tomato Red - Tier 1 events
+    'World Premiere': '2',          # Orange - Tier 2 events
+    'Calling': '4',                 # Green - Tier 3 events
+    'Battle Hardened': '5',         # Blue - Tier 4 events
+}
+
+# Emoji matching each event type's calendar color
+EVENT_COLOR_EMOJIS = {
+    'World Championship': '🔴',     # Red
+    'National Championship': '🔴',  # Red
+    'Pro Tour': '🔴',               # Red
+    'World Premiere': '🟠',         # Orange
+    'Calling': '🟢',                # Green
+    'Battle Hardened': '🔵',        # Blue
+}
 
 # Setup logging
-logger = setup_logging()
+logger = setup_logging('fab_major_global_events', __name__)
 
 # Log script start
 logger.info("=" * 80)
 logger.info("FAB Major Global Events Scraper Started")
-logger.info(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+logger.info(f"Timestamp: {RUN_STARTED_AT.strftime('%Y-%m-%d %H:%M:%S')}")
 logger.info(f"Global URL: {FAB_GLOBAL_URL}")
 logger.info(f"Local URL: {FAB_LOCAL_URL}")
 logger.info(f"Calendar ID: {CALENDAR_ID}")
@@ -93,15 +126,31 @@ logger.info(f"Include Global Majors: {INCLUDE_GLOBAL_MAJORS}")
 logger.info(f"Include US Battle Hardened: {INCLUDE_US_BATTLE_HARDENED}")
 logger.info("=" * 80)
 
-def fetch_page(url: str) -> Optional[str]:
-    """Fetch a web page"""
-    headers = {
+def create_page_session() -> requests.Session:
+    """Create a keep-alive session shared by all page fetches"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=PAGE_POOL_CONNECTIONS, pool_maxsize=PAGE_POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
+    })
+    return session
+
+PAGE_SESSION = create_page_session()
+
+# Page HTML by URL; failed fetches are not cached so a later call can retry
+_page_cache: Dict[str, str] = {}
+
+def fetch_page(url: str) -> Optional[str]:
+    """Fetch a web page (cached per URL for the life of the process)"""
+    if url in _page_cache:
+        return _page_cache[url]
     
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = PAGE_SESSION.get(url, timeout=30)
         response.raise_for_status()
+        _page_cache[url] = response.text
         return response.text
     except requests.RequestException as e:
         logger.error(f"Network error fetching {url}: {e}")
@@ -116,162 +165,57 @@ def normalize_text(text: str) -> str:
 
 def find_date_in_text(text: str) -> Optional[str]:
     """Find date patterns in text using regex patterns"""
-    date_patterns = [
-        # Single month patterns (3-letter abbrev or full name)
-        r'([A-Za-z]{3,9}\s+\d{1,2}-\d{1,2},?\s+\d{4})',  # Aug/August 15-17, 2025
-        r'([A-Za-z]{3,9}\s+\d{1,2}-\d{1,2}\s+\d{4})',    # Aug/August 15-17 2025
-        r'([A-Za-z]{3,9}\s+\d{1,2}\s*-\s*\d{1,2},?\s+\d{4})',  # Aug/August 15 - 17, 2025
-        r'([A-Za-z]{3,9}\s+\d{1,2}\s*-\s*\d{1,2}\s+\d{4})',    # Aug/August 15 - 17 2025
-
-        # Cross-month patterns
-        r'([A-Za-z]{3,9}\s+\d{1,2}\s*-\s*[A-Za-z]{3,9}\s+\d{1,2},?\s+\d{4})',  # Oct 31 - Nov 2, 2025
-        r'([A-Za-z]{3,9}\s+\d{1,2}\s*-\s*[A-Za-z]{3,9}\s+\d{1,2}\s+\d{4})',    # Oct 31 - Nov 2 2025
-
-        # Dates without year
-        r'([A-Za-z]{3,9}\s+\d{1,2}\s*-\s*[A-Za-z]{3,9}\s+\d{1,2})',  # Oct 31 - Nov 2
-    ]
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, text)
-        if match:
-            date_found = match.group(1).strip()
-            # If no year in the date, add 2025
-            if not re.search(r'\d{4}', date_found):
-                date_found += ', 2025'
-            return date_found
+    match = DATE_RE.search(text)
+    if not match:
+        return None
     
-    return None
+    date_found = match.group(1).strip()
+    # If no year in the date, add 2025
+    if not YEAR_RE.search(date_found):
+        date_found += ', 2025'
+    return date_found
 
 def extract_event_info_from_text(text: str) -> tuple[Optional[str], Optional[str]]:
     """Extract event type and location from text using regex patterns"""
-    event_patterns = [
-        r'(Battle Hardened):\s*([^,\n]+)',        # Battle Hardened: Seoul
-        r'(Calling):\s*([^,\n]+)',                # Calling: Seattle
-        r'(World Championship):\s*([^,\n]+)',     # World Championship: Philadelphia
-        r'(National Championship):\s*([^,\n]+)',  # National Championship: Minneapolis
-        r'(Pro Tour):\s*([^,\n]+)',               # Pro Tour: [Location]
-        r'(World Premiere):\s*([^,\n]+)',         # World Premiere: [Location]
-    ]
-    
-    for pattern in event_patterns:
-        match = re.search(pattern, text)
-        if match:
-            if len(match.groups()) == 2:
-                event_type = match.group(1).strip()
-                location = match.group(2).strip()
-                return event_type, location
+    match = EVENT_MATCH_RE.search(text)
+    if not match:
+        return None, None
     
-    return None, None
-
-def calculate_date_range_days(date_text: str) -> int:
-    """Calculate the number of days in a date range for event duration"""
-    try:
-        if '-' in date_text:
-            parts = date_text.split('-')
-            if len(parts) == 2:
-                start_part = parts[0].strip()
-                end_part = parts[1].strip()
-                
-                start_match = re.search(r'([A-Za-z]{3,9})\s+(\d{1,2})', start_part)
-                if start_match:
-                    start_month = start_match.group(1)
-                    start_day = int(start_match.group(2))
-
-                    end_match = re.search(r'([A-Za-z]{3,9})\s+(\d{1,2})', end_part)
-                    if end_match:
-                        end_month = end_match.group(1)
-                        end_day = int(end_match.group(2))
-                        
-                        year_match = re.search(r'(\d{4})', date_text)
-                        if year_match:
-                            year = int(year_match.group(1))
-                            
-                            month_names = {
-                                'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                                'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
-                                'January': 1, 'February': 2, 'March': 3, 'April': 4,
-                                'June': 6, 'July': 7, 'August': 8, 'September': 9,
-                                'October': 10, 'November': 11, 'December': 12
-                            }
-                            
-                            start_date = datetime(year, month_names[start_month], start_day)
-                            end_date = datetime(year, month_names[end_month], end_day)
-                            
-                            days_diff = (end_date - start_date).days + 1
-                            return days_diff
-        
-        return 999
-    except:
-        return 999
+    event_type = match.group(1).strip()
+    location = match.group(2).strip()
+    return event_type, location
 
+@lru_cache(maxsize=256)
 def parse_date_to_datetime(date_text: str) -> tuple[Optional[datetime], Optional[datetime]]:
-    """Convert date text to datetime objects for calendar event start and end times"""
+    """Convert date text to datetime objects for calendar event start and end times (cached per date text)"""
     try:
-        if '-' in date_text:
-            parts = date_text.split('-')
-            if len(parts) == 2:
-                start_part = parts[0].strip()
-                end_part = parts[1].strip()
-                
-                # Check if this is a cross-month date (e.g., "Oct 31 - Nov 2, 2025")
-                cross_month_match = re.search(r'([A-Za-z]{3,9})\s+(\d{1,2})\s*-\s*([A-Za-z]{3,9})\s+(\d{1,2})', date_text)
-                if cross_month_match:
-                    start_month = cross_month_match.group(1)
-                    start_day = int(cross_month_match.group(2))
-                    end_month = cross_month_match.group(3)
-                    end_day = int(cross_month_match.group(4))
-
-                    year_match = re.search(r'(\d{4})', date_text)
-                    if year_match:
-                        year = int(year_match.group(1))
-
-                        month_names = {
-                            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
-                            'January': 1, 'February': 2, 'March': 3, 'April': 4,
-                            'June': 6, 'July': 7, 'August': 8, 'September': 9,
-                            'October': 10, 'November': 11, 'December': 12
-                        }
-
-                        start_date = datetime(year, month_names[start_month], start_day)
-                        end_date = datetime(year, month_names[end_month], end_day)
-
-                        return start_date, end_date
-
-                # Single month date (e.g., "Aug 8-10, 2025")
-                start_match = re.search(r'([A-Za-z]{3,9})\s+(\d{1,2})', start_part)
-                if start_match:
-                    start_month = start_match.group(1)
-                    start_day = int(start_match.group(2))
-                    
-                    end_match = re.search(r'(\d{1,2})', end_part)
-                    if end_match:
-                        end_day = int(end_match.group(1))
-                        
-                        year_match = re.search(r'(\d{4})', date_text)
-                        if year_match:
-                            year = int(year_match.group(1))
-                            
-                            month_names = {
-                                'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                                'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
-                                'January': 1, 'February': 2, 'March': 3, 'April': 4,
-                                'June': 6, 'July': 7, 'August': 8, 'September': 9,
-                                'October': 10, 'November': 11, 'December': 12
-                            }
-                            
-                            start_date = datetime(year, month_names[start_month], start_day)
-                            end_date = datetime(year, month_names[start_month], end_day)
-                            
-                            return start_date, end_date
+        year_match = YEAR_RE.search(date_text)
+        if not year_match:
+            return None, None
+        year = int(year_match.group(1))
         
-        return None, None
+        # Cross-month date (e.g., "Oct 31 - Nov 2, 2025")
+        match = CROSS_MONTH_RE.search(date_text)
+        if match:
+            start_month, start_day, end_month, end_day = match.groups()
+        else:
+            # Single month date (e.g., "Aug 8-10, 2025")
+            match = SINGLE_MONTH_RE.search(date_text)
+            if not match:
+                return None, None
+            start_month, start_day, end_day = match.groups()
+            end_month = start_month
+        
+        start_date = datetime(year, MONTH_NAMES[start_month], int(start_day))
+        end_date = datetime(year, MONTH_NAMES[end_month], int(end_day))
+        return start_date, end_date
     except Exception as e:
         logger.error(f"Debug: Error parsing date '{date_text}': {e}")
         return None, None
 
+@lru_cache(maxsize=None)
 def should_include_event(event_type: str, location: str) -> bool:
-    """Determine if an event should be included based on filtering configuration"""
+    """Determine if an event should be included based on filtering configuration (cached; the settings are fixed at import)"""
     if not INCLUDE_GLOBAL_MAJORS:
         return False
     
@@ -293,6 +237,37 @@ def should_include_event(event_type: str, location: str) -> bool:
     
     return False
 
+def build_event(event_type: str, location: str, date_text: str, source: str, url: Optional[str]) -> Dict:
+    """Build a scraped event with its title, dedup key and calendar color computed once"""
+    normalized_location = normalize_text(location)
+    return {
+        'type': event_type,
+        'title': f"{event_type}: {normalized_location}",
+        'date_text': date_text,
+        'location': normalized_location,
+        'year': '2025',
+        'source': source,
+        'url': url,
+        'key': (event_type, normalized_location),
+        'color_id': get_event_color(event_type),
+    }
+
+def iter_event_blocks(root: Tag) -> Iterator[Tuple[Tag, str]]:
+    """Yield (tag, text) for link-free block tags whose text has an event marker, in document order
+
+    A tag's text contains the text of all its descendants, so subtrees
+    without a marker are skipped instead of calling get_text on every tag.
+    """
+    stack = [root]
+    while stack:
+        tag = stack.pop()
+        text = tag.get_text()
+        if not EVENT_MARKER_RE.search(text):
+            continue
+        if tag.name in BLOCK_TAGS and not tag.find('a'):
+            yield tag, text
+        stack.extend(reversed([child for child in tag.children if isinstance(child, Tag)]))
+
 def find_all_fab_events() -> List[Dict[str, str]]:
     """Find all FAB events using HTML parsing and regex pattern matching"""
     all_events = []
@@ -302,155 +277,126 @@ def find_all_fab_events() -> List[Dict[str, str]]:
     html = fetch_page(FAB_GLOBAL_URL)
     
     if html:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, HTML_PARSER)
+        link_index = build_link_index(soup)
         
         # Method 1: Look for specific patterns in text and find URLs
         all_text = normalize_text(soup.get_text())
-        event_matches = re.findall(r'(Battle Hardened|Calling|World Championship|National Championship|Pro Tour|World Premiere):\s*([^,\n]+)', all_text)
+        event_matches = list(EVENT_MATCH_RE.finditer(all_text))
         
         logger.info(f"Found {len(event_matches)} potential event matches in text")
         
-        for event_type, location in event_matches:
-            event_text = f"{event_type}: {location}"
-            event_index = all_text.find(event_text)
-
-            if event_index != -1:
-                # Look for date AFTER the event name (not before) to avoid picking up dates from previous events
-                start = event_index + len(event_text)
-                end = min(len(all_text), start + 200)
-                surrounding_text = all_text[start:end]
+        for match in event_matches:
+            event_type, location = match.groups()
+            
+            # Look for date AFTER the event name (not before) to avoid picking up dates from previous events
+            start = match.end()
+            end = min(len(all_text), start + 200)
+            surrounding_text = all_text[start:end]
 
-                date_found = find_date_in_text(surrounding_text)
-                
-                if date_found:
-                    # Try to find the event URL by looking for links near this event
-                    event_url = find_event_url(soup, event_type.strip(), location.strip())
-                    
-                    normalized_location = normalize_text(location.strip())
-                    event = {
-                        'type': event_type.strip(),
-                        'title': f"{event_type.strip()}: {normalized_location}",
-                        'date_text': date_found,
-                        'location': normalized_location,
-                        'year': '2025',
-                        'source': 'text_search',
-                        'url': event_url
-                    }
-                    all_events.append(event)
+            date_found = find_date_in_text(surrounding_text)
+            
+            if date_found:
+                event_type = event_type.strip()
+                location = location.strip()
+                # Try to find the event URL by looking for links near this event
+                event_url = find_event_url(link_index, event_type, location)
+                all_events.append(build_event(event_type, location, date_found, 'text_search', event_url))
         
         # Method 2: Look for specific HTML structures
-        for tag in soup.find_all(['div', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            if tag.find('a'):
-                continue
-                
-            tag_text = tag.get_text()
-            if any(event_type in tag_text for event_type in ['Calling:', 'Battle Hardened:', 'World Championship:', 'National Championship:', 'Pro Tour:']):
-                event_type, location = extract_event_info_from_text(tag_text)
-                if event_type and location:
-                    date_found = find_date_in_text(tag_text)
-                    if date_found:
-                        # Try to find the event URL
-                        event_url = find_event_url(soup, event_type, location)
-                        
-                        normalized_location = normalize_text(location)
-                        event = {
-                            'type': event_type,
-                            'title': f"{event_type}: {normalized_location}",
-                            'date_text': date_found,
-                            'location': normalized_location,
-                            'year': '2025',
-                            'source': 'html_structure',
-                            'url': event_url
-                        }
-                        all_events.append(event)
+        for tag, tag_text in iter_event_blocks(soup):
+            event_type, location = extract_event_info_from_text(tag_text)
+            if event_type and location:
+                date_found = find_date_in_text(tag_text)
+                if date_found:
+                    # Try to find the event URL
+                    event_url = find_event_url(link_index, event_type, location)
+                    all_events.append(build_event(event_type, location, date_found, 'html_structure', event_url))
         
-        # Deduplicate events
-        unique_events = []
+        # Deduplicate events (dicts keep insertion order, so the lookup is the result)
         event_lookup = {}
         
         for event in all_events:
-            event_key = f"{event['type']}:{event['location']}"
+            event_key = event['key']
             
             if event_key not in event_lookup:
                 event_lookup[event_key] = event
-                unique_events.append(event)
             else:
                 existing_event = event_lookup[event_key]
                 existing_source = existing_event.get('source', 'unknown')
                 new_source = event.get('source', 'unknown')
                 
                 if new_source == 'html_structure' and existing_source == 'text_search':
+                    # Re-insert so the replacement keeps its own (later) position
+                    del event_lookup[event_key]
                     event_lookup[event_key] = event
-                    unique_events.remove(existing_event)
-                    unique_events.append(event)
         
+        unique_events = list(event_lookup.values())
         logger.info(f"Found {len(unique_events)} unique events after deduplication")
         return unique_events
     
     return []
 
-def find_event_url(soup: BeautifulSoup, event_type: str, location: str) -> Optional[str]:
-    """Find the URL for a specific event by searching HTML links and event cards"""
+def absolute_url(href: str) -> str:
+    """Make a link from the FAB site absolute"""
+    if href.startswith('/'):
+        return f"https://fabtcg.com{href}"
+    elif href.startswith('http'):
+        return href
+    else:
+        return f"https://fabtcg.com/{href}"
+
+def build_link_index(soup: BeautifulSoup) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """Collect (text, href) for every link and every linked event card in one pass over the page"""
+    links = []
+    cards = []
+    for tag in soup.find_all(['a', 'div']):
+        if tag.name == 'a':
+            if tag.has_attr('href'):
+                links.append((tag.get_text().strip(), tag['href']))
+        elif 'listblock-item' in tag.get('class', []):
+            # The organized play page has event cards with this class
+            link = tag.find('a', href=True)
+            if link:
+                cards.append((tag.get_text().strip(), link['href']))
+    return links, cards
+
+def find_event_url(link_index: Tuple[List[Tuple[str, str]], List[Tuple[str, str]]], event_type: str, location: str) -> Optional[str]:
+    """Find the URL for a specific event among the page's links and event cards (see build_link_index)"""
     try:
-        # First, try to find the exact event card/link
-        # Look for links that contain both the event type and location
-        for link in soup.find_all('a', href=True):
-            link_text = link.get_text().strip()
-            href = link['href']
-            
-            # Check if this link contains our exact event
-            if (event_type in link_text and location in link_text):
-                # Make sure it's a relative URL that we can make absolute
-                if href.startswith('/'):
-                    return f"https://fabtcg.com{href}"
-                elif href.startswith('http'):
-                    return href
-                else:
-                    return f"https://fabtcg.com/{href}"
+        links, cards = link_index
+        location_words = location.split()
+        
+        # One pass over the links: an exact match wins outright, otherwise
+        # remember the first loose match as a last resort
+        loose_href = None
+        for link_text, href in links:
+            if event_type not in link_text:
+                continue
+            # Look for links that contain both the event type and location
+            if location in link_text:
+                return absolute_url(href)
+            # Only loosely match organized play links sharing a word with the location
+            # This prevents false matches like "Calling: Seattle" matching "Calling: Auckland"
+            if (loose_href is None and
+                '/organised-play/' in href and
+                any(word in link_text for word in location_words)):
+                loose_href = href
         
         # If no exact match, look for event cards that might contain our event
-        # The organized play page has event cards with specific structure
-        for card in soup.find_all('div', class_='listblock-item'):
-            card_text = card.get_text().strip()
-            
-            # Check if this card contains our event
+        for card_text, href in cards:
             if (event_type in card_text and location in card_text):
-                # Look for a link within this card
-                link = card.find('a', href=True)
-                if link:
-                    href = link['href']
-                    if href.startswith('/'):
-                        return f"https://fabtcg.com{href}"
-                    elif href.startswith('http'):
-                        return href
-                    else:
-                        return f"https://fabtcg.com/{href}"
+                return absolute_url(href)
         
-        # If still no match, look for any link that might be related
-        # but be more careful about matching
-        for link in soup.find_all('a', href=True):
-            link_text = link.get_text().strip()
-            href = link['href']
-            
-            # Only match if the link text is very similar to our event
-            # This prevents false matches like "Calling: Seattle" matching "Calling: Auckland"
-            if (event_type in link_text and 
-                any(word in link_text for word in location.split()) and
-                '/organised-play/' in href):  # Only match organized play links
-                
-                if href.startswith('/'):
-                    return f"https://fabtcg.com{href}"
-                elif href.startswith('http'):
-                    return href
-                else:
-                    return f"https://fabtcg.com/{href}"
+        if loose_href is not None:
+            return absolute_url(loose_href)
         
         return None
     except Exception as e:
         logger.error(f"Debug: Error finding URL for {event_type}: {location} - {e}")
         return None
 
-def setup_google_calendar() -> Optional[build]:
+def setup_google_calendar() -> Optional[Resource]:
     """Set up Google Calendar service using service account credentials"""
     try:
         if not os.path.exists(SERVICE_ACCOUNT_FILE):
@@ -461,8 +407,8 @@ def setup_google_calendar() -> Optional[build]:
             logger.error("Error: CALENDAR_ID environment variable not set")
             return None
         
-        credentials = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-        service = build('calendar', 'v3', credentials=credentials)
+        credentials = load_credentials(SERVICE_ACCOUNT_FILE)
+        service = build_calendar_service(credentials)
         
         logger.info(f"Successfully connected to Google Calendar: {CALENDAR_ID}")
         return service
@@ -473,21 +419,9 @@ def setup_google_calendar() -> Optional[build]:
 
 def get_event_color(event_type: str) -> str:
     """Get the appropriate Google Calendar color ID for different event types"""
-    # Google Calendar color IDs:
-    # 1=Red, 2=Orange, 3=Yellow, 4=Green, 5=Blue, 6=Purple, 7=Pink, 8=Gray, 9=Brown, 10=Default
-    
-    if event_type in ['World Championship', 'National Championship', 'Pro Tour']:
-        return '11'  # Tomato Red - Tier 1 events (highest)
-    elif event_type == 'World Premiere':
-        return '2'  # Orange - Tier 2 events
-    elif event_type == 'Calling':
-        return '4'  # Green - Tier 3 events
-    elif event_type == 'Battle Hardened':
-        return '5'  # Blue - Tier 4 events
-    else:
-        return '10'  # Default color for unknown types
+    return EVENT_COLORS.get(event_type, '10')  # Default color for unknown types
 
-def create_calendar_event(service: build, event: Dict[str, str]) -> Optional[Dict[str, str]]:
+def create_calendar_event(service: Resource, event: Dict[str, str]) -> Optional[Dict[str, str]]:
     """Create a Google Calendar event from FAB event data with proper formatting"""
     try:
         start_date, end_date = parse_date_to_datetime(event['date_text'])
@@ -504,8 +438,8 @@ def create_calendar_event(service: build, event: Dict[str, str]) -> Optional[Dic
         if event.get('url'):
             description += f"\n\nEvent Details: {event['url']}"
         
-        # Get appropriate color for event type
-        color_id = get_event_color(event['type'])
+        # Color for the event type (precomputed by build_event)
+        color_id = event.get('color_id') or get_event_color(event['type'])
         
         calendar_event = {
             'summary': event['title'],
@@ -614,7 +548,30 @@ def prune_missing_future_events(service, events):
 
     logger.info(f"Pruned {deleted_count} future global events not in latest scrape")
 
-def sync_events_to_calendar(service: build, events: List[Dict[str, str]]) -> None:
+def calendar_item_date(item: Dict, key: str) -> str:
+    """Return the YYYY-MM-DD date of a calendar item's 'start' or 'end'"""
+    when = item.get(key, {})
+    return when.get('date') or when.get('dateTime', '')[:10]
+
+def find_matching_calendar_item(calendar_event: Dict, items: List[Dict]) -> Optional[Dict]:
+    """Find the same-titled calendar entry overlapping the event's dates (through its end date)"""
+    start_date = calendar_event['start']['date']
+    end_date = calendar_event['end']['date']
+    for item in items:
+        if calendar_item_date(item, 'end') > start_date and calendar_item_date(item, 'start') <= end_date:
+            return item
+    return None
+
+def calendar_item_is_current(item: Dict, calendar_event: Dict) -> bool:
+    """True when an existing calendar entry already has every field the sync would write"""
+    return (item.get('summary') == calendar_event['summary'] and
+            item.get('location') == calendar_event['location'] and
+            item.get('description') == calendar_event['description'] and
+            item.get('colorId') == calendar_event['colorId'] and
+            calendar_item_date(item, 'start') == calendar_event['start']['date'] and
+            calendar_item_date(item, 'end') == calendar_event['end']['date'])
+
+def sync_events_to_calendar(service: Resource, events: List[Dict[str, str]]) -> None:
     """Sync FAB events to Google Calendar with duplicate detection and updates"""
     if not service:
         logger.error("No Google Calendar service available")
@@ -622,65 +579,50 @@ def sync_events_to_calendar(service: build, events: List[Dict[str, str]]) -> Non
     
     logger.info(f"Syncing {len(events)} events to Google Calendar...")
     
-    success_count = 0
+    pending = []
     for event in events:
         if not should_include_event(event['type'], event['location']):
             continue
         
         calendar_event = create_calendar_event(service, event)
         if calendar_event:
-            try:
-                # Check if event already exists by searching all events in date range
-                existing_events = service.events().list(
-                    calendarId=CALENDAR_ID,
-                    timeMin=calendar_event['start']['date'] + 'T00:00:00Z',
-                    timeMax=calendar_event['end']['date'] + 'T23:59:59Z',
-                    singleEvents=True
-                ).execute()
-
-                # Find exact match by title
-                found_event = None
-                for item in existing_events.get('items', []):
-                    if item.get('summary', '') == event['title']:
-                        found_event = item
-                        break
-
-                if found_event:
-                    # Update existing event
-                    event_id = found_event['id']
-                    updated_event = service.events().update(
-                        calendarId=CALENDAR_ID,
-                        eventId=event_id,
-                        body=calendar_event
-                    ).execute()
-                    logger.info(f"  [UPDATED] {event['title']}")
-                else:
-                    # Create new event
-                    created_event = service.events().insert(
-                        calendarId=CALENDAR_ID,
-                        body=calendar_event
-                    ).execute()
-                    logger.info(f"  [CREATED] {event['title']}")
-                
-                success_count += 1
-                
-            except Exception as e:
-                logger.error(f"  ❌ ERROR: {event['title']} - {e}")
+            pending.append((event, calendar_event))
+    
+    if not pending:
+        logger.info("Successfully synced 0 events to calendar")
+        return
+    
+    # List the whole date span once instead of once per event
+    window_start = min(calendar_event['start']['date'] for _, calendar_event in pending)
+    window_end = max(calendar_event['end']['date'] for _, calendar_event in pending)
+    try:
+        existing_index = fetch_calendar_index(service, CALENDAR_ID, window_start + 'T00:00:00Z', window_end + 'T23:59:59Z',
+                                              CALENDAR_INDEX_FIELDS, lambda item: item.get('summary'))
+    except Exception as e:
+        logger.error(f"Failed to fetch existing calendar events: {e}")
+        return
+    
+    # Match each event to its calendar entry and drop the ones with nothing to write
+    ops = []
+    unchanged_count = 0
+    for event, calendar_event in pending:
+        # Find exact match by title
+        found_event = find_matching_calendar_item(calendar_event, existing_index.get(event['title'], []))
+        if found_event and calendar_item_is_current(found_event, calendar_event):
+            unchanged_count += 1
+            continue
+        ops.append((event['title'], found_event['id'] if found_event else None, calendar_event))
+    
+    if unchanged_count:
+        logger.info(f"  {unchanged_count} events already up to date")
+    
+    success_count = unchanged_count + batch_upsert(service, CALENDAR_ID, ops, logger)
     
     logger.info(f"Successfully synced {success_count} events to calendar")
 
 def get_color_emoji(event_type: str) -> str:
     """Get emoji representation of event color for console display and logging"""
-    if event_type in ['World Championship', 'National Championship', 'Pro Tour']:
-        return '🔴'  # Red
-    elif event_type == 'World Premiere':
-        return '🟠'  # Orange
-    elif event_type == 'Calling':
-        return '🟢'  # Green
-    elif event_type == 'Battle Hardened':
-        return '🔵'  # Blue
-    else:
-        return '⚪'  # Default
+    return EVENT_COLOR_EMOJIS.get(event_type, '⚪')  # Default
 
 def main():
     """Main function for FAB Major Global Events scraper and calendar sync"""
@@ -8,14 +8,16 @@ for Wednesday's event synchronization runs.
 
 import os
 import sys
+import time
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List
-from googleapiclient.discovery import build
-from google.oauth2.service_account import Credentials
 from dotenv import load_dotenv
+from fab_auth import SERVICE_ACCOUNT_FILE, build_calendar_service, load_credentials
+from fab_common import DISCORD_TIMEOUT
 
 # Load environment variables
 load_dotenv(dotenv_path='.env', override=False)
@@ -23,9 +25,9 @@ import os
 if os.path.exists('.env.local'):
     load_dotenv(dotenv_path='.env.local', override=True)
 
-# Google Calendar Configuration
-SCOPES = ['https://www.googleapis.com/auth/calendar']
-SERVICE_ACCOUNT_FILE = 'sa.json'
+# A passing Calendar API check is reused for this many seconds (0 always checks)
+GCAL_HEALTH_MARKER = os.path.join('logs', '.gcal_healthy')
+GCAL_HEALTH_TTL = int(os.getenv('HEALTH_GCAL_TTL_SECONDS', '3600'))
 
 def setup_logging() -> logging.Logger:
     """Set up logging configuration for the health check script."""
@@ -59,7 +61,7 @@ def send_discord_alert(message: str, failed_checks: List[str]) -> bool:
         formatted_message = f"🚨 **FAB Events Health Check FAILED**\n{message}\n\n**Failed Checks:**\n{failed_details}"
         
         data = {"content": formatted_message}
-        response = requests.post(webhook_url, json=data)
+        response = requests.post(webhook_url, json=data, timeout=DISCORD_TIMEOUT)
         
         if response.status_code == 204:
             logger.info("Discord notification sent successfully")
@@ -92,14 +94,13 @@ def check_log_files() -> bool:
             logger.error("Logs directory not found")
             return False
         
-        # Check for recent log files
-        current_time = datetime.now()
+        # Check for recent log files (DirEntry caches file type and stat results)
+        cutoff = time.time() - 7 * 24 * 60 * 60
         recent_logs = 0
         
-        for log_file in log_dir.glob("*.log"):
-            if log_file.is_file():
-                file_age = current_time - datetime.fromtimestamp(log_file.stat().st_mtime)
-                if file_age.days < 7:
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.log') and entry.is_file() and entry.stat().st_mtime > cutoff:
                     recent_logs += 1
         
         if recent_logs > 0:
@@ -121,16 +122,29 @@ def check_google_calendar_api() -> bool:
             logger.error(f"Service account file '{SERVICE_ACCOUNT_FILE}' not found")
             return False
         
-        # Load credentials using the same method as working scripts
-        credentials = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
+        # Skip the round-trip if the API answered recently
+        if GCAL_HEALTH_TTL > 0:
+            try:
+                age = time.time() - os.stat(GCAL_HEALTH_MARKER).st_mtime
+                if age < GCAL_HEALTH_TTL:
+                    logger.info(f"Google Calendar API is accessible (cached, checked {int(age)}s ago)")
+                    return True
+            except OSError:
+                pass
         
-        # Build service using the same method as working scripts
-        service = build('calendar', 'v3', credentials=credentials)
+        # Load credentials and build the service with the shared helpers the sync scripts use
+        # (cached access token, bundled discovery document)
+        credentials = load_credentials(SERVICE_ACCOUNT_FILE)
+        service = build_calendar_service(credentials)
         
         # Test connection using the same method as working scripts
         calendar_list = service.calendarList().list(maxResults=1).execute()
         
         logger.info("Google Calendar API is accessible")
+        try:
+            Path(GCAL_HEALTH_MARKER).touch()
+        except OSError as e:
+            logger.warning(f"Could not record Calendar API health in '{GCAL_HEALTH_MARKER}': {e}")
         return True
         
     except Exception as e:
@@ -144,6 +158,8 @@ def check_required_scripts() -> bool:
             "fab_local_dfw_events.py",
             "fab_major_global_events.py",
             "clean_calendar.py",
+            "fab_auth.py",
+            "fab_common.py",
             "test_scripts.py",
             "view_logs.py"
         ]
@@ -169,13 +185,18 @@ def run_health_check() -> Dict[str, bool]:
     logger.info("Starting FAB Events Sync System Health Check")
     logger.info("=" * 50)
     
-    checks = {
-        "Container Status": check_container_status(),
-        "Log Files": check_log_files(),
-        "Google Calendar API": check_google_calendar_api(),
-        "Required Scripts": check_required_scripts()
+    check_functions = {
+        "Container Status": check_container_status,
+        "Log Files": check_log_files,
+        "Google Calendar API": check_google_calendar_api,
+        "Required Scripts": check_required_scripts
     }
     
+    # The checks are independent and mostly I/O, so run them side by side
+    with ThreadPoolExecutor(max_workers=len(check_functions)) as executor:
+        futures = {name: executor.submit(check) for name, check in check_functions.items()}
+        checks = {name: future.result() for name, future in futures.items()}
+    
     # Log results
     for check_name, status in checks.items():
         if status:
@@ -4,9 +4,9 @@ Simple Test Runner for FAB Events Scripts
 Quick way to test if scripts are working
 """
 
-import subprocess
-import sys
+import importlib.util
 import os
+from fab_common import import_with_timeout
 
 def run_test(script_name: str, description: str):
     """Run a simple test on a script"""
@@ -15,22 +15,23 @@ def run_test(script_name: str, description: str):
     print(f"Description: {description}")
     print(f"{'='*60}")
     
+    module_name = script_name.replace(".py", "")
     try:
         # Test if script can be imported
-        result = subprocess.run([
-            sys.executable, '-c', f'import {script_name.replace(".py", "")}'
-        ], capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0:
-            print(f"✅ {script_name} - Import test PASSED")
-            return True
-        else:
+        if importlib.util.find_spec(module_name) is None:
             print(f"❌ {script_name} - Import test FAILED")
-            print(f"Error: {result.stderr}")
+            print(f"Error: module '{module_name}' not found")
             return False
-            
-    except subprocess.TimeoutExpired:
-        print(f"❌ {script_name} - Import test TIMEOUT")
+        
+        import_with_timeout(module_name)
+        print(f"✅ {script_name} - Import test PASSED")
+        return True
+    
+    except TimeoutError as e:
+        print(f"❌ {script_name} - Import test TIMED OUT: {e}")
+        return False
+    except SystemExit as e:
+        print(f"❌ {script_name} - Import test FAILED: exited during import (code {e.code})")
         return False
     except Exception as e:
         print(f"❌ {script_name} - Import test ERROR: {e}")
@@ -8,6 +8,7 @@ This script tests if the Discord webhook is working correctly.
 import os
 import requests
 from dotenv import load_dotenv
+from fab_common import DISCORD_TIMEOUT
 
 def test_discord_webhook():
     """Test the Discord webhook connection."""
@@ -32,7 +33,7 @@ def test_discord_webhook():
         test_message = "🧪 **Discord Webhook Test**\nThis is a test message from your FAB Events Sync system!"
         
         data = {"content": test_message}
-        response = requests.post(webhook_url, json=data)
+        response = requests.post(webhook_url, json=data, timeout=DISCORD_TIMEOUT)
         
         if response.status_code == 204:
             print("✅ SUCCESS: Discord webhook is working!")
@@ -5,69 +5,45 @@ Tests both local and global event scripts to ensure they're working correctly
 """
 
 import os
+import re
 import sys
-import subprocess
 import logging
-from datetime import datetime
-from typing import Dict, List, Tuple
-from dotenv import load_dotenv
+import importlib.util
+from importlib.metadata import PackageNotFoundError, version
+from typing import Dict, Iterable, List, Set, Tuple
+from fab_common import import_with_timeout, load_env, setup_logging
 
 # Load environment variables
-load_dotenv(dotenv_path='.env', override=False)
-import os
-if os.path.exists('.env.local'):
-    load_dotenv(dotenv_path='.env.local', override=True)
+load_env()
+
+# Dependencies are checked against the pinned requirements file
+REQUIREMENTS_FILE = 'requirements.txt'
+# Comment marking a requirement the scripts can run without (only warned about when missing)
+OPTIONAL_MARKER = 'optional'
+# Distribution name at the start of a requirement line, followed by optional extras and then
+# a version specifier, marker, direct reference or the end of the line
+REQUIREMENT_NAME_RE = re.compile(r'([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(?:[<>=!~;@]|$)')
 
-def setup_logging():
-    """Setup logging for test results"""
-    # Create logs directory if it doesn't exist
-    os.makedirs('logs', exist_ok=True)
-    
-    # Create logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)
-    
-    # Clear any existing handlers
-    logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(console_formatter)
-    
-    # File handler with timestamp
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    file_handler = logging.FileHandler(f'logs/test_scripts_{timestamp}.log')
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(file_formatter)
-    
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
-    return logger
+# Environment variables the scripts need, with a description of each
+REQUIRED_ENV_VARS = {
+    'LOCAL_CALENDAR_ID': 'Local DFW Events Calendar',
+    'CALENDAR_ID': 'Global Major Events Calendar',
+    'SEARCH_LOCATION': 'Search Location for Local Events',
+    'FAB_LOCAL_URL': 'Local Events URL',
+    'FAB_GLOBAL_URL': 'Global Events URL'
+}
 
 # Setup logging
-logger = setup_logging()
+logger = setup_logging('test_scripts', __name__)
 
 def check_environment() -> Dict[str, str]:
     """Check if required environment variables are set"""
     logger.info("Checking environment configuration...")
     
-    required_vars = {
-        'LOCAL_CALENDAR_ID': 'Local DFW Events Calendar',
-        'CALENDAR_ID': 'Global Major Events Calendar',
-        'SEARCH_LOCATION': 'Search Location for Local Events',
-        'FAB_LOCAL_URL': 'Local Events URL',
-        'FAB_GLOBAL_URL': 'Global Events URL'
-    }
-    
     missing_vars = []
     env_status = {}
     
-    for var, description in required_vars.items():
+    for var, description in REQUIRED_ENV_VARS.items():
         value = os.getenv(var)
         if value:
             logger.info(f"✅ {var}: {description} - Configured")
@@ -85,49 +61,83 @@ def check_environment() -> Dict[str, str]:
     
     return env_status
 
+def read_requirements(requirements_file: str = REQUIREMENTS_FILE) -> List[Tuple[str, bool]]:
+    """Return (distribution name, optional) for each package listed in a requirements file
+
+    A package is optional when its line carries a "# optional" comment.
+    """
+    packages = []
+    with open(requirements_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line, _, comment = line.partition('#')
+            line = line.strip()
+            # Skip blank lines and pip options (-r, -e, --index-url, ...)
+            if not line or line.startswith('-'):
+                continue
+            match = REQUIREMENT_NAME_RE.match(line)
+            if not match:
+                # URL/VCS requirements (git+https://...) and other lines without a plain name
+                logger.warning(f"Skipping unrecognized requirement in {requirements_file}: {line}")
+                continue
+            packages.append((match.group(1), comment.strip().lower().startswith(OPTIONAL_MARKER)))
+    return packages
+
 def check_dependencies() -> bool:
-    """Check if required Python packages are installed"""
+    """Check if the packages listed in requirements.txt are installed"""
     logger.info("Checking Python dependencies...")
     
-    required_packages = [
-        'requests', 'beautifulsoup4', 'google-api-python-client',
-        'google-auth', 'python-dotenv'
-    ]
+    try:
+        required_packages = read_requirements()
+    except OSError as e:
+        logger.error(f"Could not read {REQUIREMENTS_FILE}: {e}")
+        return False
     
     missing_packages = []
+    missing_optional = []
     
-    for package in required_packages:
+    for package, optional in required_packages:
         try:
-            __import__(package.replace('-', '_'))
-            logger.info(f"✅ {package} - Installed")
-        except ImportError:
-            logger.error(f"❌ {package} - NOT INSTALLED")
-            missing_packages.append(package)
+            # Look up the installed distribution's metadata without importing the package
+            installed_version = version(package)
+            logger.info(f"✅ {package} {installed_version} - Installed")
+        except PackageNotFoundError:
+            if optional:
+                # The scripts fall back to a slower pure-Python path without it
+                logger.warning(f"⚠️ {package} - NOT INSTALLED (optional)")
+                missing_optional.append(package)
+            else:
+                logger.error(f"❌ {package} - NOT INSTALLED")
+                missing_packages.append(package)
+    
+    if missing_optional:
+        logger.warning(f"Missing optional packages: {', '.join(missing_optional)}")
     
     if missing_packages:
         logger.error(f"Missing packages: {', '.join(missing_packages)}")
-        logger.error("Install with: pip install -r requirements.txt")
+        logger.error(f"Install with: pip install -r {REQUIREMENTS_FILE}")
         return False
     
     logger.info("All required packages are installed!")
     return True
 
-def check_files() -> bool:
-    """Check if required files exist"""
+def check_files(present: Set[str]) -> bool:
+    """Check if required files exist among the names in the working directory"""
     logger.info("Checking required files...")
     
     required_files = [
         'fab_local_dfw_events.py',
         'fab_major_global_events.py',
         'clean_calendar.py',
+        'fab_auth.py',
+        'fab_common.py',
         'sa.json',
-        'requirements.txt'
+        REQUIREMENTS_FILE
     ]
     
     missing_files = []
     
     for file in required_files:
-        if os.path.exists(file):
+        if file in present:
             logger.info(f"✅ {file} - Found")
         else:
             logger.error(f"❌ {file} - NOT FOUND")
@@ -140,39 +150,33 @@ def check_files() -> bool:
     logger.info("All required files are present!")
     return True
 
-def test_script_syntax(script_path: str) -> Tuple[bool, str]:
-    """Test if a Python script has valid syntax"""
+def test_script_imports(script_path: str) -> Tuple[bool, bool, str]:
+    """Test if a Python script compiles and can import its dependencies
+    
+    Importing compiles the script, so a SyntaxError from the import is the
+    syntax check. Returns (syntax_ok, import_ok, message).
+    """
+    module_name = script_path.replace(".py", "")
     try:
-        with open(script_path, 'r') as f:
-            source = f.read()
+        if importlib.util.find_spec(module_name) is None:
+            return True, False, f"Import Error: module '{module_name}' not found"
         
-        compile(source, script_path, 'exec')
-        return True, "Syntax OK"
+        # A script that hangs at import is reported after IMPORT_TIMEOUT instead of blocking the suite
+        import_with_timeout(module_name)
+        return True, True, "Imports OK"
     except SyntaxError as e:
-        return False, f"Syntax Error: {e}"
+        # A SyntaxError in one of the script's own imports is an import failure, not a syntax failure
+        if e.filename and os.path.abspath(e.filename) != os.path.abspath(script_path):
+            return True, False, f"Import Error: {e}"
+        return False, False, f"Syntax Error: {e}"
+    except ImportError as e:
+        return True, False, f"Import Error: {e}"
+    except TimeoutError as e:
+        return True, False, f"Import test timed out: {e}"
+    except SystemExit as e:
+        return True, False, f"Import Error: script exited during import (code {e.code})"
     except Exception as e:
-        return False, f"Error: {e}"
-
-def test_script_imports(script_path: str) -> Tuple[bool, str]:
-    """Test if a Python script can import its dependencies"""
-    try:
-        # Create a test environment
-        test_env = os.environ.copy()
-        test_env['PYTHONPATH'] = os.getcwd()
-        
-        # Try to import the script
-        result = subprocess.run([
-            sys.executable, '-c', f'import {script_path.replace(".py", "")}'
-        ], capture_output=True, text=True, env=test_env, timeout=30)
-        
-        if result.returncode == 0:
-            return True, "Imports OK"
-        else:
-            return False, f"Import Error: {result.stderr}"
-    except subprocess.TimeoutExpired:
-        return False, "Import test timed out"
-    except Exception as e:
-        return False, f"Test Error: {e}"
+        return True, False, f"Test Error: {e}"
 
 def run_script_test(script_name: str, script_path: str) -> Dict[str, any]:
     """Run comprehensive tests on a script"""
@@ -186,15 +190,16 @@ def run_script_test(script_name: str, script_path: str) -> Dict[str, any]:
         'import_error': None
     }
     
-    # Test syntax
-    syntax_ok, syntax_msg = test_script_syntax(script_path)
+    # Test syntax and imports with a single import
+    syntax_ok, import_ok, message = test_script_imports(script_path)
     results['syntax_test'] = syntax_ok
+    results['import_test'] = import_ok
     if not syntax_ok:
+        syntax_msg = message
+        import_msg = "Skipped (syntax error)"
         results['syntax_error'] = syntax_msg
-    
-    # Test imports
-    import_ok, import_msg = test_script_imports(script_path)
-    results['import_test'] = import_ok
+    else:
+        import_msg = message
     if not import_ok:
         results['import_error'] = import_msg
     
@@ -223,8 +228,12 @@ def run_all_tests() -> List[Dict[str, any]]:
     # Dependencies check
     deps_ok = check_dependencies()
     
+    # List the working directory once for the file checks below
+    with os.scandir('.') as it:
+        present = {entry.name for entry in it}
+    
     # Files check
-    files_ok = check_files()
+    files_ok = check_files(present)
     
     if not deps_ok or not files_ok:
         logger.error("Prerequisites not met, skipping script tests")
@@ -239,8 +248,9 @@ def run_all_tests() -> List[Dict[str, any]]:
     
     test_results = []
     
+    # Imports run in this process and are CPU-bound, so test the scripts one at a time
     for script_name, script_path in scripts_to_test:
-        if os.path.exists(script_path):
+        if script_path in present:
             results = run_script_test(script_name, script_path)
             test_results.append(results)
         else:
@@ -248,15 +258,30 @@ def run_all_tests() -> List[Dict[str, any]]:
     
     return test_results
 
-def print_test_summary(test_results: List[Dict[str, any]]):
+def print_test_summary(test_results: Iterable[Dict[str, any]]):
     """Print a summary of all test results"""
     logger.info("=" * 80)
     logger.info("TEST SUMMARY")
     logger.info("=" * 80)
     
-    total_scripts = len(test_results)
-    syntax_passed = sum(1 for r in test_results if r['syntax_test'])
-    import_passed = sum(1 for r in test_results if r['import_test'])
+    # Count passes and collect the per-script details in one pass
+    total_scripts = syntax_passed = import_passed = 0
+    details: List[Tuple[int, str]] = []
+    for result in test_results:
+        total_scripts += 1
+        syntax_passed += result['syntax_test']
+        import_passed += result['import_test']
+        
+        syntax_status = "✅ PASS" if result['syntax_test'] else "❌ FAIL"
+        import_status = "✅ PASS" if result['import_test'] else "❌ FAIL"
+        details.append((logging.INFO, f"\n{result['script_name']}:"))
+        details.append((logging.INFO, f"  Syntax: {syntax_status}"))
+        details.append((logging.INFO, f"  Imports: {import_status}"))
+        
+        if result['syntax_error']:
+            details.append((logging.ERROR, f"    Syntax Error: {result['syntax_error']}"))
+        if result['import_error']:
+            details.append((logging.ERROR, f"    Import Error: {result['import_error']}"))
     
     logger.info(f"Total Scripts Tested: {total_scripts}")
     logger.info(f"Syntax Tests Passed: {syntax_passed}/{total_scripts}")
@@ -268,19 +293,8 @@ def print_test_summary(test_results: List[Dict[str, any]]):
         logger.error("❌ SOME TESTS FAILED! Check the logs above for details.")
     
     # Detailed results
-    for result in test_results:
-        script_name = result['script_name']
-        syntax_status = "✅ PASS" if result['syntax_test'] else "❌ FAIL"
-        import_status = "✅ PASS" if result['import_test'] else "❌ FAIL"
-        
-        logger.info(f"\n{script_name}:")
-        logger.info(f"  Syntax: {syntax_status}")
-        logger.info(f"  Imports: {import_status}")
-        
-        if result['syntax_error']:
-            logger.error(f"    Syntax Error: {result['syntax_error']}")
-        if result['import_error']:
-            logger.error(f"    Import Error: {result['import_error']}")
+    for level, message in details:
+        logger.log(level, message)
 
 def main():
     """Main test function"""
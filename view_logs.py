@@ -4,9 +4,11 @@ Simple log viewer for FAB Events Sync logs
 """
 
 import os
-import glob
 from datetime import datetime
 
+TAIL_LINES = 20  # lines of the latest log to show
+TAIL_BYTES = 8192  # bytes read from the end of the latest log
+
 def view_logs():
     """View recent log files"""
     logs_dir = "logs"
@@ -15,41 +17,46 @@ def view_logs():
         print("No logs directory found. Run the scripts first to generate logs.")
         return
     
-    # Find all log files
-    log_files = glob.glob(os.path.join(logs_dir, "*.log"))
+    # Find all log files, stat-ing each one once
+    with os.scandir(logs_dir) as it:
+        log_files = [(entry.name, entry.stat()) for entry in it if entry.name.endswith('.log') and entry.is_file()]
     
     if not log_files:
         print("No log files found.")
         return
     
     # Sort by modification time (newest first)
-    log_files.sort(key=os.path.getmtime, reverse=True)
+    log_files.sort(key=lambda log_file: log_file[1].st_mtime, reverse=True)
     
     print("FAB Events Sync Log Files:")
     print("=" * 50)
     
-    for log_file in log_files[:5]:  # Show last 5 logs
-        mod_time = datetime.fromtimestamp(os.path.getmtime(log_file))
-        file_size = os.path.getsize(log_file)
-        file_name = os.path.basename(log_file)
+    for file_name, stat in log_files[:5]:  # Show last 5 logs
+        mod_time = datetime.fromtimestamp(stat.st_mtime)
         
         print(f"{file_name}")
         print(f"  Modified: {mod_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  Size: {file_size:,} bytes")
+        print(f"  Size: {stat.st_size:,} bytes")
         print()
     
     # Show latest log content
     if log_files:
-        latest_log = log_files[0]
-        print(f"Latest log content ({os.path.basename(latest_log)}):")
+        latest_name, latest_stat = log_files[0]
+        latest_log = os.path.join(logs_dir, latest_name)
+        print(f"Latest log content ({latest_name}):")
         print("=" * 50)
         
         try:
-            with open(latest_log, 'r') as f:
-                lines = f.readlines()
-                # Show last 20 lines
-                for line in lines[-20:]:
-                    print(line.rstrip())
+            # Read only the end of the file instead of the whole log
+            with open(latest_log, 'rb') as f:
+                f.seek(max(0, latest_stat.st_size - TAIL_BYTES))
+                lines = f.read().decode('utf-8', errors='replace').splitlines()
+            # Drop the first line when the read started partway through it
+            if latest_stat.st_size > TAIL_BYTES:
+                lines = lines[1:]
+            # Show last TAIL_LINES lines
+            for line in lines[-TAIL_LINES:]:
+                print(line.rstrip())
         except Exception as e:
             print(f"Error reading log file: {e}")
 